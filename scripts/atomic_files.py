@@ -0,0 +1,13 @@
+import json
+from pathlib import Path
+
+
+def write_json_atomic(path: Path, data) -> None:
+    """
+    Write data as sorted, indented JSON through a temp file next to path, so a crash mid-write
+    leaves the previous file in place instead of a truncated one.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.tmp")
+    temp_path.write_text(json.dumps(data, indent=2, sort_keys=True), encoding="utf-8")
+    temp_path.replace(path)
@@ -0,0 +1,553 @@
+import argparse
+import base64
+import hashlib
+import json
+import os
+import random
+import re
+import shlex
+import struct
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+
+FETCH_SCRIPT = Path(__file__).resolve().parent / "fetch_projects.py"
+OWNER = "bench"
+BRANCH = "main"
+RATE_LIMIT = 5000
+MIN_REQUESTS_PER_CONNECTION = 4  # warm runs below this on the API port are not reusing keep-alive connections
+
+
+# ============ Synthetic Account ============
+
+def png_bytes(seed: int, width: int = 480, height: int = 300, block: int = 10) -> bytes:
+    """
+    A valid RGB PNG of random colour blocks. Blocks keep it compressible (tens of KB, like a real
+    screenshot) while each seed still gets its own perceptual hash.
+    """
+    rng = random.Random(seed)
+    grid = [[rng.randbytes(3) for _ in range(width // block)] for _ in range(height // block)]
+    rows = []
+    for y in range(height):
+        pixels = b"".join(cell * block for cell in grid[y // block])
+        rows.append(b"\x00" + pixels)
+
+    def chunk(kind: bytes, data: bytes) -> bytes:
+        return struct.pack(">I", len(data)) + kind + data + struct.pack(">I", zlib.crc32(kind + data))
+
+    header = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", header) + chunk(b"IDAT", zlib.compress(b"".join(rows), 6)) + chunk(b"IEND", b"")
+
+
+def title_for(index: int) -> str:
+    """ Letters only: fetch_projects.py folds trailing digits into one title, which would make every repo a duplicate. """
+    letters = ""
+    index += 1
+    while index:
+        index, rest = divmod(index - 1, 26)
+        letters = chr(ord("a") + rest) + letters
+    return f"Project {letters.title()}"
+
+
+def git_blob_sha(data: bytes) -> str:
+    return hashlib.sha1(b"blob %d\x00" % len(data) + data).hexdigest()
+
+
+class FakeRepo:
+    """
+    One synthetic repository. `files` holds everything the pipeline can download; the rest of the
+    tree is listing-only filler of tree_size entries with plausible paths and sizes.
+    """
+
+    def __init__(self, index: int, tree_size: int, readme_kb: int, images: int, seed: int):
+        rng = random.Random(f"{seed}:{index}")
+        self.index = index
+        self.name = f"project-{index:04d}"
+        self.full_name = f"{OWNER}/{self.name}"
+        self.pushed_at = f"2024-{1 + index % 12:02d}-{1 + index % 28:02d}T12:00:00Z"
+        self.language = rng.choice(("Python", "JavaScript", "TypeScript", "Kotlin", "Dart"))
+        self.topics = rng.sample(("web", "api", "android", "cli", "data", "ui", "tooling"), 3)
+
+        image_paths = [f"screenshots/screen_{n}.png" for n in range(images)]
+        readme = [f"# {title_for(index)}\n\nA synthetic repository for benchmarking.\n"]
+        readme.extend(f"![screenshot {n}]({path})\n" for n, path in enumerate(image_paths[:2]))
+        filler = "Lorem ipsum dolor sit amet, consectetur adipiscing elit. "
+        for n in range(readme_kb):  # ~1 KiB per section
+            readme.append(f"\n## Section {n}\n\n" + filler * 17 + "\n")
+        self.files: Dict[str, bytes] = {
+            "README.md": "".join(readme).encode("utf-8"),
+            "docs/guide.md": f"# Guide\n\nHow to run project {index}.\n".encode("utf-8"),
+            "docs/reference/api.md": f"# API\n\nEndpoints of project {index}.\n".encode("utf-8"),
+        }
+        if index % 3 == 0:
+            self.files["package.json"] = json.dumps({"name": f"{title_for(index)} App", "version": "1.0.0"}).encode("utf-8")
+        for n, path in enumerate(image_paths):
+            self.files[path] = png_bytes(seed * 100_003 + index * 101 + n)
+        self.files["assets/icon.png"] = png_bytes(seed + index, width=64, height=64, block=8)
+
+        self.tree = [
+            {"path": path, "mode": "100644", "type": "blob", "size": len(data), "sha": git_blob_sha(data)}
+            for path, data in self.files.items()
+        ]
+        for n in range(max(tree_size - len(self.tree), 0)):
+            path = f"src/module_{n // 25}/file_{n}.{rng.choice(('py', 'js', 'ts', 'css', 'json'))}"
+            self.tree.append({
+                "path": path,
+                "mode": "100644",
+                "type": "blob",
+                "size": rng.randint(200, 40_000),
+                "sha": hashlib.sha1(f"{self.full_name}:{path}".encode("utf-8")).hexdigest(),
+            })
+        self.blobs = {git_blob_sha(data): data for data in self.files.values()}
+        self.tree_sha = hashlib.sha1(json.dumps(self.tree, sort_keys=True).encode("utf-8")).hexdigest()
+        self.head_sha = hashlib.sha1(f"commit {self.tree_sha}".encode("utf-8")).hexdigest()
+
+    def as_json(self, api_url: str) -> Dict:
+        url = f"{api_url}/repos/{self.full_name}"
+        return {
+            "id": 100_000 + self.index,
+            "node_id": f"R_{self.index}",
+            "name": self.name,
+            "full_name": self.full_name,
+            "owner": {"login": OWNER, "id": 1, "type": "User"},
+            "private": False,
+            "fork": False,
+            "html_url": f"https://github.com/{self.full_name}",
+            "url": url,
+            "description": f"Synthetic project number {self.index}",
+            "homepage": None,
+            "language": self.language,
+            "topics": self.topics,
+            "default_branch": BRANCH,
+            "pushed_at": self.pushed_at,
+            "updated_at": self.pushed_at,
+            "created_at": "2023-01-01T00:00:00Z",
+            "stargazers_count": self.index % 7,
+            "forks_count": 0,
+        }
+
+
+# ============ GitHub Stand-in ============
+
+class TrafficCounter:
+    """
+    Requests and body bytes per category (rest, graphql, raw), plus 304s, across all server threads,
+    and the TCP connections accepted per port (api, raw).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.connections: Dict[str, int] = {}
+
+    def connect(self, role: str) -> None:
+        with self._lock:
+            self.connections[role] = self.connections.get(role, 0) + 1
+
+    def add(self, category: str, status: int, sent: int, received: int) -> None:
+        with self._lock:
+            entry = self.stats.setdefault(category, {"requests": 0, "not_modified": 0, "bytes_out": 0, "bytes_in": 0})
+            entry["requests"] += 1
+            entry["not_modified"] += status == 304
+            entry["bytes_out"] += sent
+            entry["bytes_in"] += received
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {
+                **{category: dict(entry) for category, entry in self.stats.items()},
+                "connections": dict(self.connections),
+            }
+
+
+GRAPHQL_REPO_RE = re.compile(r'(?:(\w+): )?repository\(owner: "([^"]+)", name: "([^"]+)"\)')
+GRAPHQL_OBJECT_RE = re.compile(r'(\w+): object\(expression: "([^"]+)"\)')
+
+
+class GitHubStandIn:
+    """
+    Just enough of the REST API, GraphQL API and raw.githubusercontent.com for fetch_projects.py,
+    served from a synthetic account on two local ports (API and raw, so the script's rate-limit
+    bookkeeping sees them as different hosts). Every response waits `latency` seconds first;
+    REST and raw responses carry an ETag and answer If-None-Match with 304 like GitHub does.
+    """
+
+    def __init__(self, repos: List[FakeRepo], latency: float, per_page_max: int = 100):
+        self.repos = {repo.full_name: repo for repo in repos}
+        self.order = repos
+        self.latency = latency
+        self.per_page_max = per_page_max
+        self.counter = TrafficCounter()
+        self._servers = [self._start("api"), self._start("raw")]
+        self.api_url = f"http://127.0.0.1:{self._servers[0].server_port}"
+        self.raw_url = f"http://127.0.0.1:{self._servers[1].server_port}"
+
+    def _start(self, role: str) -> ThreadingHTTPServer:
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                stand_in.counter.connect(role)
+
+            def do_GET(self):
+                stand_in.handle(self, role, "GET")
+
+            def do_POST(self):
+                stand_in.handle(self, role, "POST")
+
+            def log_message(self, *args):
+                pass
+
+        server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        return server
+
+    def close(self) -> None:
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+    # ---- dispatch ----
+
+    def handle(self, handler: BaseHTTPRequestHandler, role: str, verb: str) -> None:
+        length = int(handler.headers.get("Content-Length") or 0)
+        body = handler.rfile.read(length) if length else b""
+        if self.latency:
+            time.sleep(self.latency)
+
+        split = urlsplit(handler.path)
+        path, query = unquote(split.path), parse_qs(split.query)
+        if role == "raw":
+            category = "raw"
+            status, headers, payload = self.raw(path, handler.headers.get("Range"))
+        elif verb == "POST" and path == "/graphql":
+            category = "graphql"
+            status, headers, payload = self.graphql(json.loads(body or b"{}").get("query", ""))
+        else:
+            category = "rest"
+            status, headers, payload = self.rest(path, query, handler.headers.get("Accept", ""))
+
+        if status == 200 and verb == "GET":
+            etag = f'"{hashlib.sha1(payload).hexdigest()}"'
+            headers["ETag"] = etag
+            if handler.headers.get("If-None-Match") == etag:
+                status, payload = 304, b""
+        if role == "api":
+            headers.update({
+                "X-RateLimit-Limit": str(RATE_LIMIT),
+                "X-RateLimit-Remaining": str(RATE_LIMIT - 1),
+                "X-RateLimit-Reset": str(int(time.time()) + 3600),
+                "X-RateLimit-Resource": category if category == "graphql" else "core",
+            })
+
+        try:
+            handler.send_response(status)
+            for key, value in headers.items():
+                handler.send_header(key, value)
+            handler.send_header("Content-Length", str(len(payload)))
+            handler.end_headers()
+            handler.wfile.write(payload)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client hung up mid-response, like a header probe that has read enough or a
+            # download cancelled by the early stop; GitHub would not notice either
+            handler.close_connection = True
+        self.counter.add(category, status, len(payload), len(body))
+
+    @staticmethod
+    def json_response(data, status: int = 200, headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict, bytes]:
+        return status, {"Content-Type": "application/json; charset=utf-8", **(headers or {})}, json.dumps(data).encode("utf-8")
+
+    def not_found(self) -> Tuple[int, Dict, bytes]:
+        return self.json_response({"message": "Not Found"}, status=404)
+
+    # ---- REST ----
+
+    def rest(self, path: str, query: Dict[str, List[str]], accept: str) -> Tuple[int, Dict, bytes]:
+        if path == "/user":
+            return self.json_response({"login": OWNER, "id": 1, "type": "User", "url": f"{self.api_url}/user"})
+        if path == "/user/repos":
+            return self.repo_page(query)
+
+        match = re.match(r"^/repos/([^/]+/[^/]+)(?:/(.*))?$", path)
+        repo = self.repos.get(match.group(1)) if match else None
+        if repo is None:
+            return self.not_found()
+        rest = match.group(2) or ""
+
+        if rest == "":
+            return self.json_response(repo.as_json(self.api_url))
+        if rest == "topics":
+            return self.json_response({"names": repo.topics})
+        if rest.startswith("contents/"):
+            return self.contents(repo, rest[len("contents/"):])
+        if rest == f"branches/{BRANCH}":
+            return self.json_response({
+                "name": BRANCH,
+                "commit": {
+                    "sha": repo.head_sha,
+                    "url": f"{self.api_url}/repos/{repo.full_name}/commits/{repo.head_sha}",
+                    "commit": {"tree": {"sha": repo.tree_sha, "url": f"{self.api_url}/repos/{repo.full_name}/git/trees/{repo.tree_sha}"}},
+                },
+            })
+        if rest.startswith("git/trees/"):
+            return self.json_response({
+                "sha": repo.tree_sha,
+                "url": f"{self.api_url}/repos/{repo.full_name}/git/trees/{repo.tree_sha}",
+                "tree": repo.tree,
+                "truncated": False,
+            })
+        if rest.startswith("git/blobs/"):
+            data = repo.blobs.get(rest[len("git/blobs/"):])
+            if data is None:
+                return self.not_found()
+            if "raw" in accept:
+                return 200, {"Content-Type": "application/octet-stream"}, data
+            return self.json_response({"sha": git_blob_sha(data), "size": len(data), "encoding": "base64",
+                                       "content": base64.b64encode(data).decode("ascii")})
+        return self.not_found()
+
+    def repo_page(self, query: Dict[str, List[str]]) -> Tuple[int, Dict, bytes]:
+        per_page = min(int(query.get("per_page", ["30"])[0]), self.per_page_max)
+        page = int(query.get("page", ["1"])[0])
+        start = (page - 1) * per_page
+        items = [repo.as_json(self.api_url) for repo in self.order[start:start + per_page]]
+        headers = {}
+        if start + per_page < len(self.order):
+            headers["Link"] = f'<{self.api_url}/user/repos?per_page={per_page}&page={page + 1}>; rel="next"'
+        return self.json_response(items, headers=headers)
+
+    def contents(self, repo: FakeRepo, path: str) -> Tuple[int, Dict, bytes]:
+        data = repo.files.get(path)
+        if data is None:
+            return self.not_found()
+        return self.json_response({
+            "type": "file",
+            "encoding": "base64",
+            "size": len(data),
+            "name": path.rsplit("/", 1)[-1],
+            "path": path,
+            "sha": git_blob_sha(data),
+            "url": f"{self.api_url}/repos/{repo.full_name}/contents/{path}",
+            "download_url": f"{self.raw_url}/{repo.full_name}/{BRANCH}/{path}",
+            "content": base64.b64encode(data).decode("ascii"),
+        })
+
+    # ---- raw.githubusercontent.com ----
+
+    def raw(self, path: str, range_header: Optional[str]) -> Tuple[int, Dict, bytes]:
+        parts = path.lstrip("/").split("/", 3)
+        repo = self.repos.get("/".join(parts[:2])) if len(parts) == 4 else None
+        data = repo.files.get(parts[3]) if repo and parts[2] == BRANCH else None
+        if data is None:
+            return 404, {}, b"404: Not Found"
+        match = re.match(r"bytes=(\d+)-(\d*)$", range_header or "")
+        if match:
+            start = int(match.group(1))
+            end = int(match.group(2)) if match.group(2) else len(data) - 1
+            chunk = data[start:end + 1]
+            return 206, {"Content-Range": f"bytes {start}-{start + len(chunk) - 1}/{len(data)}"}, chunk
+        return 200, {"Content-Type": "application/octet-stream"}, data
+
+    # ---- GraphQL ----
+
+    def graphql(self, query: str) -> Tuple[int, Dict, bytes]:
+        """ Answers the repository blocks fetch_projects.py sends: object(expression:), topics and the head commit. """
+        data = {}
+        starts = list(GRAPHQL_REPO_RE.finditer(query))
+        for n, match in enumerate(starts):
+            block = query[match.end():starts[n + 1].start() if n + 1 < len(starts) else len(query)]
+            alias, owner, name = match.group(1) or "repository", match.group(2), match.group(3)
+            repo = self.repos.get(f"{owner}/{name}")
+            if repo is None:
+                data[alias] = None
+                continue
+            node = {}
+            if "repositoryTopics" in block:
+                node["repositoryTopics"] = {"nodes": [{"topic": {"name": topic}} for topic in repo.topics]}
+            if "defaultBranchRef" in block:
+                node["defaultBranchRef"] = {"target": {"oid": repo.head_sha, "tree": {"oid": repo.tree_sha}}}
+            for field, expression in GRAPHQL_OBJECT_RE.findall(block):
+                node[field] = self.graphql_object(repo, expression.split(":", 1)[1])
+            data[alias] = node
+        return self.json_response({"data": data})
+
+    @staticmethod
+    def graphql_object(repo: FakeRepo, path: str) -> Optional[Dict]:
+        def blob(data: bytes) -> Dict:
+            try:
+                return {"text": data.decode("utf-8"), "isBinary": False}
+            except UnicodeDecodeError:
+                return {"text": None, "isBinary": True}
+
+        if path in repo.files:
+            return blob(repo.files[path])
+        prefix = f"{path}/"
+        entries = []
+        for child in sorted({p[len(prefix):].split("/", 1)[0] for p in repo.files if p.startswith(prefix)}):
+            child_path = prefix + child
+            if child_path in repo.files:
+                entries.append({"name": child, "path": child_path, "type": "blob", "object": blob(repo.files[child_path])})
+            else:
+                entries.append({"name": child, "path": child_path, "type": "tree", "object": {}})
+        return {"entries": entries} if entries else None
+
+
+# ============ Runner ============
+
+def run_fetch(stand_in: GitHubStandIn, root: Path, fetch_args: List[str], log_path: Path) -> Dict:
+    """ One fetch_projects.py run in a child process: exit code, wall time, peak RSS and traffic it caused. """
+    env = {
+        **os.environ,
+        "GITHUB_TOKEN": "benchmark",
+        "GITHUB_API_URL": stand_in.api_url,
+        "GITHUB_RAW_URL": stand_in.raw_url,
+        "PORTFOLIO_ROOT": str(root),
+        "NO_PROXY": "127.0.0.1,localhost",
+        "PYTHONUNBUFFERED": "1",
+    }
+    env.pop("GITHUB_GRAPHQL_URL", None)
+    before = stand_in.counter.snapshot()
+    with open(log_path, "w", encoding="utf-8") as log:
+        started = time.perf_counter()
+        process = subprocess.Popen([sys.executable, str(FETCH_SCRIPT), *fetch_args], env=env, stdout=log, stderr=subprocess.STDOUT)
+        if hasattr(os, "wait4"):
+            _, status, usage = os.wait4(process.pid, 0)
+            process.returncode = os.waitstatus_to_exitcode(status)
+            # ru_maxrss is KiB on Linux and bytes on macOS
+            peak_rss = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+        else:  # Windows: no rusage for children
+            process.wait()
+            peak_rss = None
+        elapsed = time.perf_counter() - started
+
+    after = stand_in.counter.snapshot()
+    traffic = {}
+    for category, entry in after.items():
+        previous = before.get(category, {})
+        traffic[category] = {key: value - previous.get(key, 0) for key, value in entry.items()}
+    connections = traffic.pop("connections")
+    return {
+        "exit_code": process.returncode,
+        "wall_seconds": round(elapsed, 3),
+        "peak_rss_bytes": peak_rss,
+        "traffic": traffic,
+        "connections": connections,
+    }
+
+
+def connection_reuse_problem(result: Dict) -> Optional[str]:
+    """ Why a warm run's API traffic looks like one connection per request, or None if it does not. """
+    requests = sum(result["traffic"].get(category, {}).get("requests", 0) for category in ("rest", "graphql"))
+    connections = result["connections"].get("api", 0)
+    if requests >= 2 * MIN_REQUESTS_PER_CONNECTION and requests < connections * MIN_REQUESTS_PER_CONNECTION:
+        return f"{requests} API requests opened {connections} connections; keep-alive connections are not being reused"
+    return None
+
+
+def format_bytes(count: Optional[int]) -> str:
+    if count is None:
+        return "n/a"
+    for unit in ("B", "KiB", "MiB"):
+        if count < 1024:
+            return f"{count:.0f} {unit}" if unit == "B" else f"{count:.1f} {unit}"
+        count /= 1024
+    return f"{count:.1f} GiB"
+
+
+def print_result(label: str, result: Dict) -> None:
+    print(f"{label}: {result['wall_seconds']:.2f}s wall, peak RSS {format_bytes(result['peak_rss_bytes'])}, exit {result['exit_code']}")
+    for category in sorted(result["traffic"]):
+        entry = result["traffic"][category]
+        print(f"  {category:8} {entry['requests']:6} requests ({entry['not_modified']} not modified), "
+              f"{format_bytes(entry['bytes_out'])} down, {format_bytes(entry['bytes_in'])} up")
+    print(f"  connections: {', '.join(f'{role} {count}' for role, count in sorted(result['connections'].items())) or 'none'}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Benchmark fetch_projects.py offline against a local GitHub stand-in with a synthetic account.",
+        epilog="Arguments after -- go to fetch_projects.py, e.g. -- --graphql --workers 8",
+    )
+    parser.add_argument("--repos", type=int, default=50, help="Repositories in the synthetic account.")
+    parser.add_argument("--tree-size", type=int, default=500, help="Entries in each repository's recursive tree.")
+    parser.add_argument("--readme-kb", type=int, default=8, help="Approximate README size in KiB.")
+    parser.add_argument("--images", type=int, default=8, help="Screenshots per repository.")
+    parser.add_argument("--latency-ms", type=float, default=50.0, help="Delay added to every response.")
+    parser.add_argument("--runs", type=int, default=2, help="Runs in the same output tree; the first is cold, later ones warm.")
+    parser.add_argument("--seed", type=int, default=1, help="Seed for the synthetic account.")
+    parser.add_argument("--root", type=Path, help="Output tree for the runs (default: a temporary directory, removed afterwards).")
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON instead of a summary.")
+    parser.add_argument("fetch_args", nargs=argparse.REMAINDER, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.fetch_args[:1] == ["--"]:
+        args.fetch_args = args.fetch_args[1:]
+    if args.runs < 1:
+        parser.error("--runs must be at least 1")
+    return args
+
+
+def main() -> None:
+    args = parse_args()
+    notes = sys.stderr if args.json else sys.stdout  # keep stdout pure JSON with --json
+    started = time.perf_counter()
+    repos = [FakeRepo(n, args.tree_size, args.readme_kb, args.images, args.seed) for n in range(args.repos)]
+    print(f"Synthetic account: {args.repos} repos, {args.tree_size} tree entries, ~{args.readme_kb} KiB READMEs, "
+          f"{args.images} images each (built in {time.perf_counter() - started:.1f}s).", file=notes)
+
+    stand_in = GitHubStandIn(repos, latency=args.latency_ms / 1000)
+    scratch = None if args.root else tempfile.TemporaryDirectory(prefix="fetch_projects_bench_")
+    root = args.root or Path(scratch.name)
+    (root / "public" / "data").mkdir(parents=True, exist_ok=True)
+    (root / "docs").mkdir(exist_ok=True)
+
+    results = []
+    problems = []
+    try:
+        for n in range(args.runs):
+            label = f"run {n + 1} ({'cold' if n == 0 else 'warm'})"
+            result = run_fetch(stand_in, root, args.fetch_args, root / f"run-{n + 1}.log")
+            results.append({"run": n + 1, **result})
+            if not args.json:
+                print_result(label, result)
+            problem = connection_reuse_problem(result) if n > 0 else None
+            if problem:
+                problems.append(f"run {n + 1}: {problem}")
+                print(f"  WARNING: {problem}", file=notes)
+            if result["exit_code"] != 0:
+                log = (root / f"run-{n + 1}.log").read_text(encoding="utf-8", errors="replace")
+                print("\n".join(log.splitlines()[-20:]), file=sys.stderr)
+                break
+    finally:
+        stand_in.close()
+        if scratch is not None:
+            scratch.cleanup()
+        else:
+            print(f"Run logs and output kept in {root}", file=notes)
+
+    if args.json:
+        print(json.dumps({
+            "repos": args.repos,
+            "tree_size": args.tree_size,
+            "readme_kb": args.readme_kb,
+            "images": args.images,
+            "latency_ms": args.latency_ms,
+            "fetch_args": shlex.join(args.fetch_args),
+            "runs": results,
+        }, indent=2))
+    if problems or any(result["exit_code"] != 0 for result in results):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
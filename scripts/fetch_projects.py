@@ -1,32 +1,100 @@
+import argparse
+import asyncio
 import base64
 import hashlib
+import heapq
 import json
+import multiprocessing
 import os
+import random
 import re
+import sqlite3
+import struct
+import threading
+import time
+import uuid
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager, nullcontext
+from itertools import accumulate, repeat
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, NamedTuple, Optional, Tuple
+from urllib.parse import urlsplit
 
 import requests
+import requests.adapters
 from github import Github, GithubException
+from github.Requester import HTTPSRequestsConnectionClass, Requester, RequestsResponse
 from dotenv import load_dotenv
+from urllib3 import Retry
+
+from atomic_files import write_json_atomic
+
+try:
+    import httpx
+except ImportError:  # optional: without it images stream one at a time through requests
+    httpx = None
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError:  # optional: without them there is no near-duplicate detection or responsive variants
+    np = Image = None
 
 # ============ Configuration ============
 
 class Config:
     MAX_IMAGES_PER_REPO = 6  # default per user instruction
     MIN_IMAGE_SIZE = 5_000  # bytes; still filters favicons but keeps lightweight PNGs in docs
+    MIN_IMAGE_SIDE = 100  # pixels; a shorter side below this is a badge, favicon or toolbar icon
+    PROBE_BYTES = 16 * 1024  # leading bytes range-requested to read dimensions before a full transfer
+    PHASH_MAX_DISTANCE = 10  # differing bits (of 64) at or below which two images are the same picture
+    RESPONSIVE_WIDTHS = (480, 960, 1600)  # srcset widths; the smallest WebP doubles as the card thumb
+    VARIANT_FORMATS = ("avif", "webp")  # best first; formats this Pillow build cannot encode are skipped
+    VARIANT_QUALITY = 70
+    AVIF_SPEED = 8  # 0-10; Pillow's default 6 takes ~3x as long for ~15% smaller files. Drop "avif" above to skip it
     IMAGE_EXTS = {".png", ".jpg", ".jpeg", ".webp", ".gif", ".svg"}
     IMAGE_KEYWORDS = ("screenshot", "screen", "demo", "preview", "capture", "ui", "mock", "example", "docs")
+    IMAGE_FOLDERS = ("screenshot", "screens", "docs", "assets", "public", "static", "fastlane", "images", "img")
     SKIP_ICON_NAMES = ("logo", "icon", "favicon", "apple-touch-icon")
+    # Tree image scoring: each rule adds its points once when any of its substrings is in the lower-cased path
+    IMAGE_SCORE_RULES = (
+        (20, IMAGE_KEYWORDS),  # obvious screenshot names
+        (10, IMAGE_FOLDERS),  # typical asset folders
+        (-20, SKIP_ICON_NAMES),  # icons/logos are penalized, not banned, in case they are the only image
+    )
+    IMAGE_SIZE_SCORE = (10, 50_000, 2_000_000)  # base points, +1 per this many bytes, counted up to this size
+    README_IMAGE_SCORE = 50  # README images outrank anything found only in the tree
     PRESERVE_IF_NO_NEW_IMAGES = True  # keep existing when nothing new discovered
-    MAX_DOWNLOAD_ATTEMPTS_PER_REPO = 8   # keep runs under ~5 minutes
+    MAX_DOWNLOAD_ATTEMPTS_PER_REPO = 16  # transfers per repo; concurrent downloads keep this cheap
+    MAX_DOCS_BYTES_PER_REPO = 512 * 1024  # markdown under docs/ (nested folders included) added to the context
+    IMAGE_HASH_LENGTH = 20  # hex chars of sha256 used for store file names
     REQUEST_TIMEOUT = 10  # seconds per image fetch
+    DOWNLOAD_CHUNK_SIZE = 64 * 1024  # bytes per streamed read
+    HOST_CONCURRENCY = {"api.github.com": 4, "raw.githubusercontent.com": 8}  # simultaneous image transfers per host
+    DEFAULT_HOST_CONCURRENCY = 4
+    WORKERS = 4  # repos processed concurrently; output is identical for any value
+    HTTP_POOL_SIZE = 16  # keep-alive connections shared by all worker threads
+    GRAPHQL_BATCH_SIZE = 20  # repos per GraphQL query in --graphql mode
+    SECONDS_BETWEEN_REQUESTS = 0.05  # PyGithub pacing is per client, so keep it light when fanning out
+    HTTP_CACHE_MAX_BYTES = 512 * 1024 * 1024  # on-disk response cache cap; least recently used entries go first
+    RATE_LIMIT_RESERVE = 200  # API calls kept for repo metadata; image work stops below this
+    RATE_LIMIT_PACE_BELOW = 1000  # start spreading calls over the time left until reset
+    RATE_LIMIT_RETRIES = 5  # per request, for 403/429 rate-limit responses
+    MAX_RATE_LIMIT_WAIT = 15 * 60  # seconds; longer waits for a reset give up instead
+    BACKOFF_BASE = 2.0  # seconds; secondary-limit backoff doubles from here, with jitter
+    MAX_BACKOFF = 120.0
 
 
 # ============ Auth Helpers ============
 
 load_dotenv()
 GITHUB_TOKEN = os.getenv("GITHUB_TOKEN")
+# Overridable so scripts/benchmark_fetch_projects.py can point a run at its local stand-in
+GITHUB_API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com")
+GITHUB_GRAPHQL_URL = os.getenv("GITHUB_GRAPHQL_URL", f"{GITHUB_API_URL}/graphql")
+GITHUB_RAW_URL = os.getenv("GITHUB_RAW_URL", "https://raw.githubusercontent.com")
 
 
 def get_token_from_gh_cli() -> Optional[str]:
@@ -75,13 +143,373 @@ if not GITHUB_TOKEN:
     raise SystemExit(1)
 
 
+def github_auth_headers(url: str) -> Dict[str, str]:
+    """
+    The token header for a request to GitHub's API or raw host, and nothing for any other host:
+    image URLs come from README markdown, so never send credentials wherever they happen to point.
+    """
+    host = urlsplit(url).hostname
+    if host and host in (urlsplit(GITHUB_API_URL).hostname, urlsplit(GITHUB_RAW_URL).hostname):
+        return {"Authorization": f"token {GITHUB_TOKEN}"}
+    return {}
+
+
+# ============ HTTP Transport ============
+
+class HTTPCache:
+    """
+    Persistent GET response cache in SQLite, used for conditional requests.
+    Entries keep the ETag / Last-Modified validators and the body; GitHub answers a
+    revalidation with 304, which does not count against the primary rate limit.
+    """
+
+    def __init__(self, path: Path, max_bytes: int = Config.HTTP_CACHE_MAX_BYTES):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(path), check_same_thread=False)
+        self._db.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                key TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                headers TEXT NOT NULL,
+                body BLOB NOT NULL,
+                size INTEGER NOT NULL,
+                last_used REAL NOT NULL
+            )
+            """
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used)")
+        self._db.commit()
+        self.revalidated = 0
+        self.stored = 0
+
+    @staticmethod
+    def key_for(request: requests.PreparedRequest) -> str:
+        # GitHub varies responses on Accept and Authorization; never store the token itself
+        auth = request.headers.get("Authorization", "")
+        auth_hash = hashlib.sha1(auth.encode("utf-8")).hexdigest()[:12] if auth else "anon"
+        return f"{request.url} {request.headers.get('Accept', '')} {auth_hash}"
+
+    def lookup(self, key: str) -> Optional[Tuple[Optional[str], Optional[str], Dict[str, str], bytes]]:
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, headers, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+        etag, last_modified, headers, body = row
+        return etag, last_modified, json.loads(headers), body
+
+    def store(self, key: str, response: requests.Response) -> None:
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        body = response.content
+        if len(body) > self.max_bytes:
+            return
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, json.dumps(dict(response.headers)), body, len(body), time.time()),
+            )
+            self._evict()
+            self._db.commit()
+            self.stored += 1
+
+    def _evict(self) -> None:
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+HTTP_CACHE: Optional[HTTPCache] = None  # opened by main() unless --no-cache
+
+
+class Priority:
+    METADATA = 0  # repo listing, topics, READMEs, manifests, docs
+    IMAGES = 1  # trees for image discovery and image transfers
+
+
+class RateLimitReserved(requests.RequestException):
+    """ Raised instead of spending the last RATE_LIMIT_RESERVE API calls on image work. """
+
+
+class RequestScheduler:
+    """
+    Central gate for every request on the shared session. Tracks X-RateLimit-* per resource,
+    paces API calls once the budget runs low, waits out 403/429 rate-limit responses
+    (Retry-After, the reset time, or jittered exponential backoff for secondary limits),
+    and lets queued metadata calls go ahead of image work.
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._local = threading.local()
+        self._waiting = [0, 0]  # threads queued per priority
+        self._next_slot = 0.0
+        self._budgets: Dict[str, Dict] = {}
+        self.billed: Dict[str, int] = {}
+        self.paced = 0
+        self.retries = 0
+        self.refused = 0
+
+    @contextmanager
+    def priority(self, level: int):
+        previous = getattr(self._local, "priority", Priority.METADATA)
+        self._local.priority = level
+        try:
+            yield
+        finally:
+            self._local.priority = previous
+
+    def send(self, request: requests.PreparedRequest, transmit) -> requests.Response:
+        is_api = urlsplit(request.url).netloc == urlsplit(GITHUB_API_URL).netloc
+        resource = "graphql" if request.url.startswith(GITHUB_GRAPHQL_URL) else "core"
+        attempt = 0
+        while True:
+            if is_api:
+                self._acquire(resource)
+            response = transmit()
+            if is_api:
+                self._record(resource, response)
+            delay = self._retry_delay(response, attempt)
+            if delay is None or attempt >= Config.RATE_LIMIT_RETRIES:
+                return response
+            response.close()
+            attempt += 1
+            self.retries += 1
+            print(f"    rate limited (HTTP {response.status_code}), retrying in {delay:.0f}s")
+            time.sleep(delay)
+
+    def _acquire(self, resource: str) -> None:
+        priority = getattr(self._local, "priority", Priority.METADATA)
+        with self._cond:
+            budget = self._budgets.get(resource)
+            if priority > Priority.METADATA and budget and budget["remaining"] <= Config.RATE_LIMIT_RESERVE:
+                self.refused += 1
+                raise RateLimitReserved(f"{resource} budget down to {budget['remaining']}, keeping it for repo metadata")
+
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    now = time.time()
+                    if not any(self._waiting[:priority]) and now >= self._next_slot:
+                        break
+                    if now < self._next_slot:
+                        self.paced += 1
+                    self._cond.wait(timeout=max(self._next_slot - now, 0.05))
+            finally:
+                self._waiting[priority] -= 1
+
+            self._next_slot = now + self._interval(budget)
+            self._cond.notify_all()
+
+    @staticmethod
+    def _interval(budget: Optional[Dict]) -> float:
+        if not budget or budget["remaining"] >= Config.RATE_LIMIT_PACE_BELOW:
+            return 0.0
+        return max(budget["reset"] - time.time(), 0) / max(budget["remaining"], 1)
+
+    def _record(self, resource: str, response: requests.Response) -> None:
+        headers = response.headers
+        resource = headers.get("X-RateLimit-Resource", resource)
+        with self._cond:
+            if response.status_code != 304:
+                self.billed[resource] = self.billed.get(resource, 0) + 1
+            if "X-RateLimit-Remaining" in headers:
+                self._budgets[resource] = {
+                    "limit": int(headers.get("X-RateLimit-Limit", 0)),
+                    "remaining": int(headers["X-RateLimit-Remaining"]),
+                    "reset": int(headers.get("X-RateLimit-Reset", 0)),
+                }
+
+    @staticmethod
+    def _retry_delay(response: requests.Response, attempt: int) -> Optional[float]:
+        if response.status_code not in (403, 429):
+            return None
+        retry_after = response.headers.get("Retry-After")
+        if retry_after and retry_after.isdigit():
+            return int(retry_after) + random.uniform(0, 1)
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            wait = int(response.headers.get("X-RateLimit-Reset", 0)) - time.time() + 1
+            return wait if 0 < wait <= Config.MAX_RATE_LIMIT_WAIT else None
+        if response.status_code == 429 or b"secondary rate limit" in response.content.lower():
+            return min(Config.BACKOFF_BASE * 2 ** attempt, Config.MAX_BACKOFF) * random.uniform(0.5, 1.5)
+        # Plain 403: a permission problem, retrying will not help
+        return None
+
+    def report(self) -> str:
+        lines = []
+        for resource in sorted(set(self.billed) | set(self._budgets)):
+            line = f"  {resource}: {self.billed.get(resource, 0)} billed requests"
+            budget = self._budgets.get(resource)
+            if budget:
+                line += (f", {budget['remaining']}/{budget['limit']} left"
+                         f" (resets {time.strftime('%H:%M', time.localtime(budget['reset']))})")
+            lines.append(line)
+        lines.append(f"  {self.paced} paced waits, {self.retries} rate-limit retries, {self.refused} image calls refused to save budget")
+        return "\n".join(lines)
+
+
+SCHEDULER = RequestScheduler()
+
+
+class GitHubHTTPAdapter(requests.adapters.HTTPAdapter):
+    """
+    Transport for the shared session. Every request goes through SCHEDULER; GETs found in
+    HTTP_CACHE are sent with If-None-Match / If-Modified-Since, and a 304 is turned back into
+    the cached 200 so callers (PyGithub included) never see the difference.
+    """
+
+    def send(self, request: requests.PreparedRequest, stream: bool = False, **kwargs) -> requests.Response:
+        def transmit() -> requests.Response:
+            return super(GitHubHTTPAdapter, self).send(request, stream=stream, **kwargs)
+
+        cache = HTTP_CACHE
+        if cache is None or request.method != "GET" or stream:
+            return SCHEDULER.send(request, transmit)
+
+        key = cache.key_for(request)
+        cached = cache.lookup(key)
+        if cached:
+            etag, last_modified, _, _ = cached
+            if etag:
+                request.headers["If-None-Match"] = etag
+            if last_modified:
+                request.headers["If-Modified-Since"] = last_modified
+
+        response = SCHEDULER.send(request, transmit)
+
+        if response.status_code == 304 and cached:
+            # The empty 304 body is never read by requests once _content is set, so hand the connection back here
+            response.raw.drain_conn()
+            response.raw.release_conn()
+            _, _, headers, body = cached
+            # Fresh rate-limit and validator headers from the 304 win over the stored ones
+            headers.update(response.headers)
+            response.status_code = 200
+            response.reason = "OK"
+            response.headers = requests.structures.CaseInsensitiveDict(headers)
+            response._content = body
+            cache.revalidated += 1
+        elif response.status_code == 200:
+            cache.store(key, response)
+        return response
+
+
+_http_session: Optional[requests.Session] = None
+_http_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """
+    One keep-alive requests.Session shared by every thread. The urllib3 pool is thread-safe,
+    so workers reuse connections instead of opening one per request.
+    """
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            session = requests.Session()
+            # Non-None auth stops requests from falling back to ~/.netrc (same as PyGithub)
+            session.auth = Requester.noopAuth
+            adapter = GitHubHTTPAdapter(
+                # Connection errors and 5xx only; rate-limit responses belong to SCHEDULER
+                max_retries=Retry(total=3, backoff_factor=0.5, status_forcelist=(502, 503, 504), respect_retry_after_header=False),
+                pool_connections=Config.HTTP_POOL_SIZE,
+                pool_maxsize=Config.HTTP_POOL_SIZE,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+
+class PooledHTTPSConnection(HTTPSRequestsConnectionClass):
+    """
+    Drop-in PyGithub connection backed by the shared session.
+    PyGithub splits a call into request() + getresponse() on one connection object, which races
+    when several threads share a Github client, so the pending request is kept per thread.
+    """
+
+    _pending = threading.local()
+    protocol = "https"
+    default_port = 443
+
+    def __init__(self, host: str, port: Optional[int] = None, strict: bool = False, timeout: Optional[int] = None,
+                 retry=None, pool_size: Optional[int] = None, **kwargs) -> None:
+        self.port = port if port else self.default_port
+        self.host = host
+        self.timeout = timeout
+        self.verify = kwargs.get("verify", True)
+        self.session = get_http_session()
+
+    def request(self, verb: str, url: str, input, headers: Dict[str, str], stream: bool = False) -> None:
+        self._pending.call = (verb, url, input, headers, stream)
+
+    def getresponse(self) -> RequestsResponse:
+        verb, url, input, headers, stream = self._pending.call
+        r = self.session.request(
+            verb,
+            f"{self.protocol}://{self.host}:{self.port}{url}",
+            headers=headers,
+            data=input,
+            timeout=self.timeout,
+            verify=self.verify,
+            allow_redirects=False,
+            stream=stream,
+        )
+        return RequestsResponse(r)
+
+    def close(self) -> None:
+        # The session outlives individual connections
+        pass
+
+
+class PooledHTTPConnection(PooledHTTPSConnection):
+    """ Plain-HTTP twin, for an API base URL like the benchmark's local stand-in. """
+
+    protocol = "http"
+    default_port = 80
+
+
+# Relies on PyGithub internals (the connection classes, RequestsResponse, noopAuth and this test
+# hook), hence the pinned range in requirements.txt. The retry PyGithub passes in is dropped on
+# purpose: the session adapter retries connection errors and 5xx, and SCHEDULER owns rate limits,
+# so GithubRetry would only retry the same responses a second time.
+Requester.injectConnectionClasses(PooledHTTPConnection, PooledHTTPSConnection)
+
+
 # ============ Paths ============
 
-BASE_DIR = Path(__file__).resolve().parent.parent
+BASE_DIR = Path(os.getenv("PORTFOLIO_ROOT") or Path(__file__).resolve().parent.parent)  # benchmarks write to a scratch copy
+PORTFOLIO_REPO = os.getenv("PORTFOLIO_REPO", "theGoodB0rg/theGoodPortfolio")  # the repo BASE_DIR is a checkout of
 DATA_FILE = BASE_DIR / "public" / "data" / "projects.json"
 DOCS_DIR = BASE_DIR / "docs"
+CACHE_DIR = BASE_DIR / ".cache" / "fetch_projects"
+SYNC_MANIFEST_FILE = CACHE_DIR / "sync_manifest.json"
+SECTIONS_DIR = CACHE_DIR / "sections"
+JOURNAL_FILE = CACHE_DIR / "journal.jsonl"
 CONTEXT_FILE = DOCS_DIR / "ALL_PROJECTS_CONTEXT.md"
+CONTEXT_SHARDS_DIR = DOCS_DIR / "projects"  # one file per repo with --context-shards
+CONTEXT_INDEX_FILE = CACHE_DIR / "context_index.sqlite"  # full-text index; query with scripts/search_context.py
 PROJECTS_ASSET_DIR = BASE_DIR / "public" / "projects"
+IMAGE_STORE_DIR = PROJECTS_ASSET_DIR / "store"  # content-addressed; shared by every project
+IMAGE_VARIANTS_DIR = IMAGE_STORE_DIR / "variants"  # resized AVIF/WebP copies, named after their source
 
 DOCS_DIR.mkdir(exist_ok=True)
 PROJECTS_ASSET_DIR.mkdir(exist_ok=True)
@@ -114,12 +542,117 @@ def normalize_title(text: str) -> str:
     return re.sub(r"(?:v)?\d+$", "", cleaned)
 
 
-def get_file_content(repo, path: str) -> Optional[str]:
-    try:
-        content_file = repo.get_contents(path)
-        return base64.b64decode(content_file.content).decode("utf-8", errors="ignore")
-    except (GithubException, Exception):
-        return None
+class ContentCache:
+    """
+    Per-run cache of decoded repository files keyed by (repo full_name, ref, path).
+    404s are cached as None so a missing file is asked for once; other failures are not cached.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Tuple[str, str, str], Optional[str]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.fetches = 0
+
+    def get(self, repo, path: str, ref: Optional[str] = None) -> Optional[str]:
+        ref = ref or repo.default_branch or "main"
+        key = (repo.full_name, ref, path)
+        with self._lock:
+            if key in self._entries:
+                self.hits += 1
+                return self._entries[key]
+
+        try:
+            content_file = repo.get_contents(path, ref=ref)
+            text = base64.b64decode(content_file.content).decode("utf-8", errors="ignore")
+        except GithubException as exc:
+            if exc.status != 404:
+                return None
+            text = None
+        except Exception:
+            # Directories come back as lists, oversized files without content, etc.
+            return None
+
+        with self._lock:
+            self.fetches += 1
+            self._entries[key] = text
+        return text
+
+    def missing(self, repo, paths: List[str], ref: Optional[str] = None) -> List[str]:
+        """ The paths not yet cached, in order. """
+        ref = ref or repo.default_branch or "main"
+        with self._lock:
+            return [path for path in paths if (repo.full_name, ref, path) not in self._entries]
+
+    def put(self, repo, path: str, text: Optional[str], ref: Optional[str] = None) -> None:
+        """ Seed an entry fetched elsewhere (GraphQL prefetch); None records a known-missing file. """
+        ref = ref or repo.default_branch or "main"
+        with self._lock:
+            self._entries[(repo.full_name, ref, path)] = text
+
+
+CONTENT_CACHE = ContentCache()
+
+
+class TreeEntry(NamedTuple):
+    """ The fields of a git tree element the pipeline reads; PyGithub objects carry far more per entry. """
+    path: str
+    size: Optional[int]
+    sha: str
+    type: str
+
+
+class RepoSnapshot:
+    """
+    The recursive git tree of a repo's default branch, fetched once per run and shared by
+    display-name resolution, docs and image discovery. A complete snapshot knows every path
+    in the repo, so files it does not list are never requested. A failed or truncated tree
+    fetch gives an incomplete snapshot, which answers "maybe" for every path.
+    """
+
+    def __init__(self, repo):
+        try:
+            tree = repo.get_git_tree(repo.default_branch or "main", recursive=True)
+            self.entries = [TreeEntry(entry.path, entry.size, entry.sha, entry.type) for entry in tree.tree]
+            self.complete = not getattr(tree, "truncated", False)
+            self.sha = tree.sha
+        except (GithubException, requests.RequestException):
+            self.entries: List[TreeEntry] = []
+            self.complete = False
+            self.sha = ""
+        self.paths = {entry.path for entry in self.entries if entry.type == "blob"}
+
+    def may_have(self, path: str) -> bool:
+        return not self.complete or path in self.paths
+
+
+_snapshots: Dict[str, RepoSnapshot] = {}
+_snapshots_lock = threading.Lock()
+
+
+def get_snapshot(repo) -> RepoSnapshot:
+    with _snapshots_lock:
+        snapshot = _snapshots.get(repo.full_name)
+    if snapshot is None:
+        # Each repo is handled by one worker at a time, so two fetches of one tree do not happen
+        snapshot = RepoSnapshot(repo)
+        with _snapshots_lock:
+            _snapshots[repo.full_name] = snapshot
+    return snapshot
+
+
+def release_snapshots(full_names) -> None:
+    """ Forget snapshots no later pass will read; a large tree otherwise stays in memory for the whole run. """
+    with _snapshots_lock:
+        for full_name in full_names:
+            _snapshots.pop(full_name, None)
+
+
+def get_file_content(repo, path: str, ref: Optional[str] = None) -> Optional[str]:
+    """ Text of a file, or None. On the default branch, paths missing from the snapshot cost no request. """
+    if ref is None and CONTENT_CACHE.missing(repo, [path]) and not get_snapshot(repo).may_have(path):
+        CONTENT_CACHE.put(repo, path, None)
+    return CONTENT_CACHE.get(repo, path, ref)
 
 
 def parse_readme_images(readme_text: str, repo_full_name: str, branch: str) -> List[Dict]:
@@ -133,16 +666,16 @@ def parse_readme_images(readme_text: str, repo_full_name: str, branch: str) -> L
 
     def to_raw(url: str):
         if url.startswith("http://") or url.startswith("https://"):
-            if "raw.githubusercontent.com" in url:
-                parts = url.split("raw.githubusercontent.com/")
-                if len(parts) == 2:
-                    subparts = parts[1].split('/')
-                    if len(subparts) >= 4:
-                        # [user, repo, branch, path...]
-                        return url, "/".join(subparts[3:])
+            # Only URLs really on the raw host get a path; anything else is dropped before any request
+            split = urlsplit(url)
+            if split.hostname == urlsplit(GITHUB_RAW_URL).hostname:
+                subparts = split.path.lstrip("/").split("/")
+                if len(subparts) >= 4:
+                    # [user, repo, branch, path...]
+                    return url, "/".join(subparts[3:])
             return url, ""
         cleaned = url.lstrip("./")
-        return f"https://raw.githubusercontent.com/{repo_full_name}/{branch}/{cleaned}", cleaned
+        return f"{GITHUB_RAW_URL}/{repo_full_name}/{branch}/{cleaned}", cleaned
 
     md_pattern = re.compile(r"!\[(?P<alt>[^\]]*)\]\((?P<src>[^)]+)\)")
     html_pattern = re.compile(r'<img[^>]*src=["\'](?P<src>[^"\']+)["\'][^>]*alt=["\']?(?P<alt>[^"\'>]*)', re.IGNORECASE)
@@ -209,123 +742,809 @@ def derive_display_name(repo) -> str:
     return repo.name.replace("-", " ").title()
 
 
+IMAGE_SCORE_PATTERNS = [
+    (points, re.compile("|".join(re.escape(part) for part in parts))) for points, parts in Config.IMAGE_SCORE_RULES
+]
+IMAGE_EXT_SUFFIXES = tuple(Config.IMAGE_EXTS)
+IMAGE_EXT_TAIL = max(len(ext) for ext in Config.IMAGE_EXTS)
+
+
+def score_image_paths(paths: List[str], sizes: List[int]) -> List[int]:
+    """
+    Score tree paths in bulk: each rule's alternation regex makes one pass over all paths joined
+    by newlines, and every match offset maps back (by bisection) to the path it fell in.
+    """
+    base, bytes_per_point, size_cap = Config.IMAGE_SIZE_SCORE
+    scores = [base + min(size, size_cap) // bytes_per_point for size in sizes]
+    if not paths:
+        return scores
+    lowered = [path.lower() for path in paths]
+    starts = list(accumulate((len(path) + 1 for path in lowered[:-1]), initial=0))
+    joined = "\n".join(lowered)
+    for points, pattern in IMAGE_SCORE_PATTERNS:
+        for index in {bisect_right(starts, match.start()) - 1 for match in pattern.finditer(joined)}:
+            scores[index] += points
+    return scores
+
+
 def discover_image_candidates(repo) -> List[Dict]:
     """
     Collect potential image URLs from README and repository tree, score them for relevance.
     """
     branch = repo.default_branch or "main"
-    candidates: Dict[str, Dict] = {}
+    limit = Config.MAX_DOWNLOAD_ATTEMPTS_PER_REPO * 2  # keep a buffer beyond attempts cap
 
     # README-sourced images have highest priority
+    readme_candidates: Dict[str, Dict] = {}
     readme_text = get_file_content(repo, "README.md")
     for item in parse_readme_images(readme_text or "", repo.full_name, branch):
-        key = item["src"]
-        if key not in candidates:
-            candidates[key] = {**item, "source": "readme"}
+        if item["src"] not in readme_candidates:
+            readme_candidates[item["src"]] = {**item, "score": Config.README_IMAGE_SCORE, "source": "readme"}
 
     # Tree walk for image files
-    try:
-        tree = repo.get_git_tree(branch, recursive=True).tree
-    except GithubException:
-        tree = []
+    tree = get_snapshot(repo).entries
 
+    # Extension filter first, on the tail only, so huge trees cost one cheap check per entry
+    blob_shas: Dict[str, Tuple[str, int]] = {}
+    paths: List[str] = []
+    sizes: List[int] = []
     for entry in tree:
-        path_lower = entry.path.lower()
-        ext = Path(entry.path).suffix.lower()
-        if ext not in Config.IMAGE_EXTS:
+        if not entry.path[-IMAGE_EXT_TAIL:].lower().endswith(IMAGE_EXT_SUFFIXES):
             continue
+        blob_shas[entry.path] = (entry.sha, entry.size)
         if entry.size and entry.size < Config.MIN_IMAGE_SIZE:
             continue
-
-        # Base score. Larger files are typically higher fidelity screenshots/mockups.
-        score = 10 + (min(entry.size, 2000000) // 50000)  # Add up to 40 points based on size
-        
-        # Bonus points for obvious screenshot folders/names
-        if any(k in path_lower for k in Config.IMAGE_KEYWORDS):
-            score += 20
-        if any(seg in path_lower for seg in ("screenshot", "screens", "docs", "assets", "public", "static", "fastlane", "images", "img")):
-            score += 10
-            
-        # Penalize icons/logos but don't ban them completely in case it's the only image
-        if any(skip in path_lower for skip in Config.SKIP_ICON_NAMES):
-            score -= 20
-
-        raw_url = f"https://raw.githubusercontent.com/{repo.full_name}/{branch}/{entry.path}"
-        if raw_url not in candidates:
-            candidates[raw_url] = {
+        paths.append(entry.path)
+        sizes.append(entry.size or 0)
+
+    # README images that live in this repo get their blob SHA and size too, so the blob index can
+    # match them and tiny ones are dropped without a request
+    for key, item in list(readme_candidates.items()):
+        if item.get("path") in blob_shas:
+            item["sha"], item["size"] = blob_shas[item["path"]]
+            if item["size"] and item["size"] < Config.MIN_IMAGE_SIZE:
+                del readme_candidates[key]
+
+    # Top-K instead of a full sort; README duplicates of tree paths are dropped afterwards, so
+    # take enough to cover them. nlargest keeps tree order among equal scores.
+    scores = score_image_paths(paths, sizes)
+    best = heapq.nlargest(limit + len(readme_candidates), range(len(paths)), key=scores.__getitem__)
+    candidates = list(readme_candidates.values())
+    for index in sorted(best):
+        raw_url = f"{GITHUB_RAW_URL}/{repo.full_name}/{branch}/{paths[index]}"
+        if raw_url not in readme_candidates:
+            candidates.append({
                 "src": raw_url,
                 "caption": "",
-                "score": score,
+                "score": scores[index],
                 "source": "tree",
-                "path": entry.path,
-                "size": entry.size,
-            }
+                "path": paths[index],
+                "size": sizes[index],
+                "sha": blob_shas[paths[index]][0],
+            })
+
+    # Highest score first; README images lead among equal scores
+    return heapq.nlargest(limit, candidates, key=lambda c: c["score"])
+
+
+def read_image_size(head: bytes) -> Optional[Tuple[int, int]]:
+    """
+    (width, height) from the first bytes of a PNG, GIF, WebP or JPEG file, or None when the
+    format is unknown (SVG included) or the header is not in the bytes given.
+    """
+    if head.startswith(b"\x89PNG\r\n\x1a\n") and len(head) >= 24:
+        return struct.unpack(">II", head[16:24])
+    if head[:6] in (b"GIF87a", b"GIF89a") and len(head) >= 10:
+        return struct.unpack("<HH", head[6:10])
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP" and len(head) >= 30:
+        chunk = head[12:16]
+        if chunk == b"VP8 ":
+            width, height = struct.unpack("<HH", head[26:30])
+            return width & 0x3FFF, height & 0x3FFF
+        if chunk == b"VP8L":
+            bits = int.from_bytes(head[21:25], "little")
+            return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+        if chunk == b"VP8X":
+            return int.from_bytes(head[24:27], "little") + 1, int.from_bytes(head[27:30], "little") + 1
+        return None
+    if head[:2] == b"\xff\xd8":
+        # Walk the segments to the first start-of-frame marker
+        offset = 2
+        while offset + 9 <= len(head):
+            if head[offset] != 0xFF:
+                return None
+            marker = head[offset + 1]
+            if marker in (0xD8, 0x01) or 0xD0 <= marker <= 0xD7:
+                offset += 2
+                continue
+            if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+                height, width = struct.unpack(">HH", head[offset + 5:offset + 9])
+                return width, height
+            offset += 2 + struct.unpack(">H", head[offset + 2:offset + 4])[0]
+    return None
+
+
+def stored_image_size(url: str) -> Optional[Tuple[int, int]]:
+    """ Dimensions of an image already in the store; JPEGs with a large EXIF block need the whole file. """
+    path = IMAGE_STORE_DIR / url.rsplit("/", 1)[-1]
+    try:
+        with open(path, "rb") as f:
+            head = f.read(Config.PROBE_BYTES)
+            return read_image_size(head) or read_image_size(head + f.read())
+    except OSError:
+        return None
+
+
+def probe_image_header(url: str) -> Optional[bytes]:
+    """
+    First PROBE_BYTES of a remote image via a range request. Hosts that ignore Range still only
+    have PROBE_BYTES read before the connection is dropped. None when the probe fails.
+    """
+    headers = {**github_auth_headers(url), "Range": f"bytes=0-{Config.PROBE_BYTES - 1}"}
+    try:
+        with get_http_session().get(url, headers=headers, stream=True, timeout=Config.REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            return response.raw.read(Config.PROBE_BYTES, decode_content=True)
+    except (requests.RequestException, OSError):
+        return None
+
+
+def probe_image_candidates(candidates: List[Dict]) -> List[Dict]:
+    """
+    Cheap pre-download stage. Resolves blob-index hits, reads pixel dimensions (from the store
+    for hits, from a ranged probe otherwise), drops candidates whose shorter side is under
+    MIN_IMAGE_SIDE and adds a resolution bonus to the score. Returns copies in score order, with
+    "store_url" set on blob-index hits and "width"/"height" wherever the header was readable.
+    """
+    probed = []
+    for item in candidates:
+        src_path = item.get("path")
+        ext = os.path.splitext(src_path or "")[1]
+        if not src_path or ext.lower() not in Config.IMAGE_EXTS:
+            continue
+        item = {**item, "store_url": BLOB_INDEX.lookup(item.get("sha")) if BLOB_INDEX else None}
+        probed.append(item)
+
+    # SVGs are vector, so there is nothing to measure
+    remote = [item for item in probed if not item["store_url"] and not item["path"].lower().endswith(".svg")]
+    if ASYNC_DOWNLOADER is not None:
+        heads = ASYNC_DOWNLOADER.probe([item["src"] for item in remote])
+    else:
+        heads = [probe_image_header(item["src"]) for item in remote]
+    sizes = {id(item): read_image_size(head) for item, head in zip(remote, heads) if head}
+
+    kept = []
+    for item in probed:
+        size = stored_image_size(item["store_url"]) if item["store_url"] else sizes.get(id(item))
+        if size:
+            width, height = size
+            if min(width, height) < Config.MIN_IMAGE_SIDE:
+                print(f"    skip {item['path']} (too small: {width}x{height} px)")
+                continue
+            item["width"], item["height"] = width, height
+            item["score"] = item.get("score", 0) + min(width * height, 2_000_000) // 100_000  # up to 20 points
+        kept.append(item)
+
+    # Stable, so equal scores keep discovery order
+    return sorted(kept, key=lambda c: c.get("score", 0), reverse=True)
+
+
+class BlobIndex:
+    """
+    Persistent map of git blob SHA -> image store file name. Tree entries already carry the
+    blob SHA, so a candidate whose blob is in the store is linked without any transfer.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        self.reused = 0
+        try:
+            self._entries: Dict[str, str] = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._entries = {}
+
+    def lookup(self, sha: Optional[str]) -> Optional[str]:
+        if not sha:
+            return None
+        with self._lock:
+            name = self._entries.get(sha)
+            if not name or not (IMAGE_STORE_DIR / name).exists():
+                return None
+            self.reused += 1
+        return image_store_url(name)
+
+    def record(self, sha: Optional[str], url: str) -> None:
+        if sha:
+            with self._lock:
+                self._entries[sha] = url.rsplit("/", 1)[-1]
+
+    def save(self) -> None:
+        with self._lock:
+            # Drop blobs the garbage collector removed from the store
+            entries = {sha: name for sha, name in self._entries.items() if (IMAGE_STORE_DIR / name).exists()}
+        write_json_atomic(self.path, entries)
+
+
+BLOB_INDEX: Optional[BlobIndex] = None  # opened by main()
+
+
+def perceptual_hash(path: Path) -> Optional[int]:
+    """
+    64-bit difference hash: the picture shrunk to 9x8 grayscale, one bit per pixel for whether
+    it is brighter than its right neighbour. Re-encoding and resizing barely move it. None
+    without numpy/Pillow or for files Pillow cannot read (SVG).
+    """
+    if Image is None:
+        return None
+    try:
+        with Image.open(path) as img:
+            img.draft("L", (64, 64))  # JPEGs decode straight to a small grayscale image
+            pixels = np.asarray(img.convert("L").resize((9, 8), Image.LANCZOS), dtype=np.int16)
+    except (OSError, ValueError, Image.DecompressionBombError):
+        return None
+    return int.from_bytes(np.packbits(pixels[:, 1:] > pixels[:, :-1]).tobytes(), "big")
+
+
+class PerceptualIndex:
+    """
+    Persistent map of image store file name -> perceptual hash. Store files are content
+    addressed, so an entry never goes stale and each image is decoded once across runs.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._lock = threading.Lock()
+        try:
+            self._entries: Dict[str, int] = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            self._entries = {}
+
+    def hash_for(self, url: str) -> Optional[int]:
+        name = url.rsplit("/", 1)[-1]
+        with self._lock:
+            if name in self._entries:
+                return self._entries[name]
+        phash = perceptual_hash(IMAGE_STORE_DIR / name)
+        if phash is not None:
+            with self._lock:
+                self._entries[name] = phash
+        return phash
+
+    def save(self) -> None:
+        with self._lock:
+            entries = {name: phash for name, phash in self._entries.items() if (IMAGE_STORE_DIR / name).exists()}
+        write_json_atomic(self.path, entries)
+
+
+PERCEPTUAL_INDEX: Optional[PerceptualIndex] = None  # opened by main() when numpy and Pillow are installed
+
+
+class ImageSelection:
+    """
+    Greedy pick in candidate order, on top of images already taken. Rejects a store file that
+    is already in, and anything within PHASH_MAX_DISTANCE bits of an image already in.
+    """
+
+    def __init__(self, taken: List[Dict] = ()):
+        self.urls = {image["url"] for image in taken}
+        self.hashes = [self._hash(image["url"]) for image in taken]
+        self.slots = Config.MAX_IMAGES_PER_REPO - len(taken)
+
+    @staticmethod
+    def _hash(url: str) -> Optional[int]:
+        return PERCEPTUAL_INDEX.hash_for(url) if PERCEPTUAL_INDEX else None
+
+    def full(self) -> bool:
+        return self.slots <= 0
+
+    def offer(self, url: str) -> Optional[str]:
+        """ Takes the image and returns None, or returns why it was turned down. """
+        # Same bytes under two paths only fill one slot
+        if url in self.urls:
+            return "same file as an image already picked"
+        phash = self._hash(url)
+        if phash is not None and any(
+            other is not None and (phash ^ other).bit_count() <= Config.PHASH_MAX_DISTANCE for other in self.hashes
+        ):
+            return "near-duplicate of an image already picked"
+        self.urls.add(url)
+        self.hashes.append(phash)
+        self.slots -= 1
+        return None
+
+
+def image_store_url(name: str) -> str:
+    return f"./projects/{IMAGE_STORE_DIR.name}/{name}"
+
+
+def commit_to_store(temp_path: Path, digest: str, ext: str) -> str:
+    """
+    Atomically move a finished temp file into the content-addressed store and return its public URL.
+    The same bytes reached through another URL or repo land on the same file.
+    """
+    ext = ext.lower()
+    if ext == ".jpeg":
+        ext = ".jpg"
+    name = f"{digest[:Config.IMAGE_HASH_LENGTH]}{ext}"
+    dest_file = IMAGE_STORE_DIR / name
+    if dest_file.exists():
+        temp_path.unlink()
+    else:
+        temp_path.replace(dest_file)
+    return image_store_url(name)
+
+
+class StoreDownload:
+    """
+    One image on its way into the store: a temp file hashed and sized chunk by chunk, so peak
+    memory is one chunk. REQUEST_TIMEOUT bounds the whole transfer, not just each socket read.
+    The temp file is removed when the block exits with any error, cancellation included.
+    """
+
+    def __init__(self):
+        IMAGE_STORE_DIR.mkdir(parents=True, exist_ok=True)
+        self.temp_path = IMAGE_STORE_DIR / f".download.{uuid.uuid4().hex}.tmp"
+        self.digest = hashlib.sha256()
+        self.size = 0
+        self._deadline = time.monotonic() + Config.REQUEST_TIMEOUT
+        self._file = None
+
+    def __enter__(self) -> "StoreDownload":
+        self._file = open(self.temp_path, "wb")
+        return self
+
+    def write(self, chunk: bytes) -> None:
+        if time.monotonic() > self._deadline:
+            raise TimeoutError(f"transfer took longer than {Config.REQUEST_TIMEOUT}s")
+        self.digest.update(chunk)
+        self.size += len(chunk)
+        self._file.write(chunk)
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._file.close()
+        if exc_type is not None:
+            self.temp_path.unlink(missing_ok=True)
+
+    def commit(self, ext: str) -> Tuple[Optional[str], int]:
+        """ (store URL, size) for the finished file; the URL is None when it is under MIN_IMAGE_SIZE. """
+        if self.size < Config.MIN_IMAGE_SIZE:
+            self.temp_path.unlink()
+            return None, self.size
+        return commit_to_store(self.temp_path, self.digest.hexdigest(), ext), self.size
+
+
+def stream_to_store(url: str, ext: str, headers: Dict[str, str]) -> Tuple[Optional[str], int]:
+    """ Stream one image through the shared keep-alive session into the store. Returns (store URL, size). """
+    with StoreDownload() as download:
+        with get_http_session().get(url, headers=headers, stream=True, timeout=Config.REQUEST_TIMEOUT) as response:
+            response.raise_for_status()
+            for chunk in response.iter_content(Config.DOWNLOAD_CHUNK_SIZE):
+                download.write(chunk)
+    return download.commit(ext)
+
+
+def download_to_store(repo, item: Dict, ext: str) -> Tuple[Optional[str], int]:
+    """
+    Raw file URL first (not billed to the REST rate limit), then the git blob API when we know the
+    blob SHA. Both return raw bytes, with no 1 MB contents-API limit and no base64.
+    """
+    try:
+        return stream_to_store(item["src"], ext, github_auth_headers(item["src"]))
+    except requests.RequestException:
+        if not item.get("sha"):
+            raise
+    return download_blob_to_store(repo, item, ext)
+
+
+def download_blob_to_store(repo, item: Dict, ext: str) -> Tuple[Optional[str], int]:
+    blob_url = f"{GITHUB_API_URL}/repos/{repo.full_name}/git/blobs/{item['sha']}"
+    with SCHEDULER.priority(Priority.IMAGES):
+        return stream_to_store(
+            blob_url, ext, {**github_auth_headers(blob_url), "Accept": "application/vnd.github.raw"}
+        )
+
+
+class AsyncImageDownloader:
+    """
+    One asyncio loop (on its own thread) and one HTTP/2 httpx client for the whole run. Worker
+    threads hand over a repo's candidates; transfers run concurrently under per-host limits, no
+    more at once than there are open image slots, and stop as soon as the leading candidates
+    have produced MAX_IMAGES_PER_REPO usable images.
+    """
+
+    def __init__(self):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="image-downloader", daemon=True)
+        self._thread.start()
+        self._client = None
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+
+    def _get_client(self):
+        # Only ever touched from the loop thread, so no locking
+        if self._client is None:
+            try:
+                import h2  # noqa: F401
+                http2 = True
+            except ImportError:
+                http2 = False
+            self._client = httpx.AsyncClient(
+                http2=http2,
+                timeout=Config.REQUEST_TIMEOUT,
+                follow_redirects=True,
+            )
+        return self._client
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        host = urlsplit(url).hostname or ""
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(Config.HOST_CONCURRENCY.get(host, Config.DEFAULT_HOST_CONCURRENCY))
+        return self._host_limits[host]
+
+    def download(self, repo, entries: List[Tuple[Dict, str, Optional[str]]], taken: List[Dict] = ()) -> List[Tuple[Optional[str], int, Optional[BaseException]]]:
+        """
+        entries are (candidate, ext, store URL already known from the blob index) in score order.
+        Returns (store URL, size, error) per entry; entries cancelled by the early stop, or never
+        started because enough were in flight, come back with a CancelledError and are never
+        needed by the caller.
+        """
+        return asyncio.run_coroutine_threadsafe(self._download_all(repo, entries, taken), self._loop).result()
+
+    async def _download_all(self, repo, entries, taken):
+        async def known(url: str):
+            return url, 0
+
+        async def indexed(transfer):
+            # Hash off the loop, so the prefix check below only ever reads the index
+            url, size = await transfer
+            if url and PERCEPTUAL_INDEX:
+                await asyncio.to_thread(PERCEPTUAL_INDEX.hash_for, url)
+            return url, size
+
+        def prefix_fills_slots() -> bool:
+            # Only a finished prefix counts, so the picked set never depends on network timing
+            selection = ImageSelection(taken)
+            for task in tasks:
+                if not task.done():
+                    return False
+                if not task.cancelled() and task.exception() is None and task.result()[0]:
+                    selection.offer(task.result()[0])
+                    if selection.full():
+                        return True
+            return False
+
+        def open_slots() -> int:
+            # Slots not already claimed by an accepted image, a task still running or a finished
+            # image whose fate waits on a running task before it
+            selection = ImageSelection(taken)
+            claimed = 0
+            settled = True
+            for task in tasks:
+                if not task.done():
+                    settled = False
+                    claimed += 1
+                elif not task.cancelled() and task.exception() is None and task.result()[0]:
+                    if not settled:
+                        claimed += 1
+                    else:
+                        selection.offer(task.result()[0])
+            return selection.slots - claimed
+
+        def launch() -> set:
+            # Start entries in order only while they could still fill a slot, so no image is
+            # downloaded just to be left out of the pick (and garbage-collected after the run)
+            started = set()
+            while len(tasks) < len(entries) and open_slots() > 0:
+                item, ext, url = entries[len(tasks)]
+                task = asyncio.ensure_future(indexed(known(url) if url else self._fetch(repo, item, ext)))
+                tasks.append(task)
+                started.add(task)
+            return started
+
+        tasks = []
+        pending = launch()
+        try:
+            while pending:
+                _, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if prefix_fills_slots():
+                    for other in pending:
+                        other.cancel()
+                    await asyncio.gather(*pending, return_exceptions=True)
+                    pending = set()
+                else:
+                    pending |= launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        results = []
+        for task in tasks:
+            if task.cancelled():
+                results.append((None, 0, asyncio.CancelledError()))
+            elif task.exception() is not None:
+                results.append((None, 0, task.exception()))
+            else:
+                results.append((*task.result(), None))
+        # Entries never started were not needed
+        results += [(None, 0, asyncio.CancelledError())] * (len(entries) - len(tasks))
+        return results
+
+    def probe(self, urls: List[str]) -> List[Optional[bytes]]:
+        """ Concurrent probe_image_header; one leading-bytes buffer (or None) per URL. """
+        return asyncio.run_coroutine_threadsafe(self._probe_all(urls), self._loop).result()
+
+    async def _probe_all(self, urls: List[str]) -> List[Optional[bytes]]:
+        return await asyncio.gather(*(self._probe(url) for url in urls))
+
+    async def _probe(self, url: str) -> Optional[bytes]:
+        head = bytearray()
+        try:
+            async with self._host_limit(url):
+                headers = {**github_auth_headers(url), "Range": f"bytes=0-{Config.PROBE_BYTES - 1}"}
+                async with self._get_client().stream("GET", url, headers=headers) as response:
+                    response.raise_for_status()
+                    async for chunk in response.aiter_bytes():
+                        head += chunk
+                        if len(head) >= Config.PROBE_BYTES:
+                            break
+        except httpx.HTTPError:
+            return None
+        return bytes(head[:Config.PROBE_BYTES])
+
+    async def _fetch(self, repo, item: Dict, ext: str) -> Tuple[Optional[str], int]:
+        try:
+            async with self._host_limit(item["src"]):
+                return await self._stream_to_store(item["src"], ext)
+        except httpx.HTTPError:
+            if not item.get("sha"):
+                raise
+        # The blob API is billed, so it goes through SCHEDULER on a worker thread, and it counts
+        # against the API host's limit like any other request there
+        async with self._host_limit(GITHUB_API_URL):
+            return await asyncio.to_thread(download_blob_to_store, repo, item, ext)
+
+    async def _stream_to_store(self, url: str, ext: str) -> Tuple[Optional[str], int]:
+        """ Async twin of stream_to_store; StoreDownload holds everything but the transfer itself. """
+        with StoreDownload() as download:
+            async with self._get_client().stream("GET", url, headers=github_auth_headers(url)) as response:
+                response.raise_for_status()
+                async for chunk in response.aiter_bytes(Config.DOWNLOAD_CHUNK_SIZE):
+                    download.write(chunk)
+        return download.commit(ext)
+
+    def close(self) -> None:
+        if self._client is not None:
+            asyncio.run_coroutine_threadsafe(self._client.aclose(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+ASYNC_DOWNLOADER: Optional[AsyncImageDownloader] = None  # started by main() when httpx is installed
+
 
-    # Return sorted list (highest score first) and cap to avoid huge trees
-    sorted_candidates = sorted(candidates.values(), key=lambda c: c.get("score", 0), reverse=True)
-    return sorted_candidates[: Config.MAX_DOWNLOAD_ATTEMPTS_PER_REPO * 2]  # keep a buffer beyond attempts cap
+# Per-repo files the pipeline wrote before the shared store: {name}_{sha1(src)[:8]}{ext}
+LEGACY_IMAGE_NAME = re.compile(r"^.+_[0-9a-f]{8}\.(?:png|jpe?g|webp|gif|svg)$", re.IGNORECASE)
 
 
-def download_images(repo, candidates: List[Dict], dest_root: Path) -> List[Dict]:
+def collect_image_garbage(projects: List[Dict]) -> int:
     """
-    Download the top-ranked image candidates into per-repo folder.
-    Returns list of dicts with local url and caption.
+    Delete store blobs, variants and old per-repo pipeline images that no project image, srcset
+    or thumb points at. Hand-placed files (names without the pipeline's hash suffix) are never
+    touched. Returns the number removed.
     """
-    if not candidates:
+    referenced = set()
+    for project in projects:
+        referenced.add(project.get("thumb"))
+        for image in project.get("images", []):
+            referenced.add(image.get("url"))
+            referenced.update(variant["url"] for variant in image.get("srcset", []))
+
+    garbage = []
+    if IMAGE_STORE_DIR.exists():
+        variants = IMAGE_VARIANTS_DIR.iterdir() if IMAGE_VARIANTS_DIR.exists() else []
+        garbage += [blob for blob in [*IMAGE_STORE_DIR.iterdir(), *variants] if blob.is_file()]
+    legacy_dirs = [d for d in PROJECTS_ASSET_DIR.iterdir() if d.is_dir() and d != IMAGE_STORE_DIR] if PROJECTS_ASSET_DIR.exists() else []
+    garbage += [f for d in legacy_dirs for f in d.iterdir() if f.is_file() and LEGACY_IMAGE_NAME.match(f.name)]
+
+    removed = 0
+    for path in garbage:
+        if f"./projects/{path.relative_to(PROJECTS_ASSET_DIR).as_posix()}" not in referenced:
+            path.unlink()
+            removed += 1
+    for folder in legacy_dirs:
+        if not any(folder.iterdir()):
+            folder.rmdir()
+    return removed
+
+
+def download_images(repo, candidates: List[Dict], taken: List[Dict] = ()) -> List[Dict]:
+    """
+    Download the top-ranked image candidates into the shared image store, filling the slots
+    left after `taken` and skipping anything that looks the same as an image already picked.
+    Returns list of dicts with local url, caption and the source path in the repo.
+    """
+    if not candidates or len(taken) >= Config.MAX_IMAGES_PER_REPO:
         return []
 
-    dest_root.mkdir(parents=True, exist_ok=True)
+    with SCHEDULER.priority(Priority.IMAGES):
+        candidates = probe_image_candidates(candidates)
+        if ASYNC_DOWNLOADER is not None:
+            picked = _download_images_concurrently(repo, candidates, taken)
+        else:
+            picked = _download_images(repo, candidates, taken)
+
+    # Dimensions let the frontend reserve layout space; a probe can miss a JPEG frame header
+    for image in picked:
+        size = None if "width" in image else stored_image_size(image["url"])
+        if size:
+            image["width"], image["height"] = size
+    return picked
+
+
+def picked_image(item: Dict, url: str) -> Dict:
+    image = {"url": url, "caption": item.get("caption", "")[:140], "path": item["path"]}
+    if "width" in item:
+        image["width"], image["height"] = item["width"], item["height"]
+    return image
+
+
+def _download_images_concurrently(repo, candidates: List[Dict], taken: List[Dict]) -> List[Dict]:
+    entries: List[Tuple[Dict, str, Optional[str]]] = []
+    transfers = 0
+    for item in candidates:
+        url = item["store_url"]
+        if url is None:
+            if transfers >= Config.MAX_DOWNLOAD_ATTEMPTS_PER_REPO:
+                break
+            transfers += 1
+        entries.append((item, os.path.splitext(item["path"])[1], url))
 
     picked = []
-    seen_names = set()
+    selection = ImageSelection(taken)
+    for (item, ext, known_url), (url, size, error) in zip(entries, ASYNC_DOWNLOADER.download(repo, entries, taken)):
+        if selection.full():
+            break
+        if error is not None:
+            print(f"    error downloading {item['path']}: {error}")
+            continue
+        if url is None:
+            print(f"    skip {item['path']} (too small: {size} bytes)")
+            continue
+        if known_url is None and BLOB_INDEX:
+            BLOB_INDEX.record(item.get("sha"), url)
+
+        reason = selection.offer(url)
+        if reason:
+            print(f"    skip {item['path']} ({reason})")
+            continue
+        picked.append(picked_image(item, url))
+
+    return picked
+
+
+def _download_images(repo, candidates: List[Dict], taken: List[Dict]) -> List[Dict]:
+    picked = []
+    selection = ImageSelection(taken)
     attempts = 0
     for item in candidates:
-        if len(picked) >= Config.MAX_IMAGES_PER_REPO:
+        if selection.full():
             break
         if attempts >= Config.MAX_DOWNLOAD_ATTEMPTS_PER_REPO:
             print(f"    stopping after {attempts} attempts (cap)")
             break
 
-        src_path = item.get("path")
-        if not src_path:
-             continue
-             
-        filename = Path(src_path).name
-        name_root, ext = os.path.splitext(filename)
-        if ext.lower() not in Config.IMAGE_EXTS:
-            continue
+        src_path = item["path"]
+        ext = os.path.splitext(src_path)[1]
+        url = item["store_url"]
+        if url is None:
+            attempts += 1
+            try:
+                url, size = download_to_store(repo, item, ext)
+            except Exception as exc:
+                print(f"    error downloading {src_path}: {exc}")
+                continue
+            if url is None:
+                print(f"    skip {src_path} (too small: {size} bytes)")
+                continue
+            if BLOB_INDEX:
+                BLOB_INDEX.record(item.get("sha"), url)
 
-        # Stable filename
-        short_hash = hashlib.sha1(item["src"].encode("utf-8")).hexdigest()[:8]
-        safe_name = f"{name_root}_{short_hash}{ext}".replace("%", "")
-        if safe_name in seen_names:
+        reason = selection.offer(url)
+        if reason:
+            print(f"    skip {src_path} ({reason})")
             continue
+        picked.append(picked_image(item, url))
+
+    return picked
 
-        dest_file = dest_root / safe_name
 
-        attempts += 1
+def list_doc_entries(repo) -> List[TreeEntry]:
+    """
+    Tree entries to pick docs from. An incomplete snapshot may be missing docs/, so its entries
+    are topped up with a listing of the top-level docs folder: the one the GraphQL prefetch
+    already returned when there is one, otherwise a REST directory listing.
+    """
+    snapshot = get_snapshot(repo)
+    if snapshot.complete:
+        return snapshot.entries
+
+    listing = GRAPHQL_PREFETCH.get(repo.full_name, {}).get("docs")
+    if listing is None:
         try:
-            content_file = repo.get_contents(src_path)
-            content = base64.b64decode(content_file.content)
-            
-            if len(content) < Config.MIN_IMAGE_SIZE:
-                print(f"    skip {src_path} (too small: {len(content)} bytes)")
-                continue
-            with open(dest_file, "wb") as f:
-                f.write(content)
-        except Exception as exc:
-            print(f"    error downloading {src_path} via API: {exc}")
+            contents = repo.get_contents("docs")
+        except GithubException:
+            contents = []
+        if not isinstance(contents, list):
+            contents = [contents]
+        listing = [TreeEntry(item.path, item.size, item.sha, "blob") for item in contents if item.type == "file"]
+    known = {entry.path for entry in snapshot.entries}
+    return snapshot.entries + [entry for entry in listing if entry.path not in known]
+
+
+def own_output_paths(repo) -> Tuple[str, ...]:
+    """
+    Repo paths this script writes, when the repo is the portfolio itself. Its docs/ holds the
+    combined context and the per-repo shards, which would otherwise be read back as its own docs.
+    """
+    if repo.full_name.lower() != PORTFOLIO_REPO.lower():
+        return ()
+    return CONTEXT_FILE.relative_to(BASE_DIR).as_posix(), CONTEXT_SHARDS_DIR.relative_to(BASE_DIR).as_posix() + "/"
+
+
+def select_doc_paths(tree: List, skip: Tuple[str, ...] = ()) -> List[str]:
+    """
+    Markdown files anywhere under docs/, in path order, up to MAX_DOCS_BYTES_PER_REPO in total.
+    A file that would overflow the cap is left out and smaller ones after it still fit. Paths
+    starting with anything in skip are never taken.
+    """
+    paths = []
+    budget = Config.MAX_DOCS_BYTES_PER_REPO
+    for entry in sorted(tree, key=lambda e: e.path):
+        if entry.type != "blob" or not entry.path.startswith("docs/") or not entry.path.endswith(".md"):
+            continue
+        if skip and entry.path.startswith(skip):
+            continue
+        if (entry.size or 0) > budget:
+            print(f"    skip {entry.path} ({entry.size} bytes; docs cap reached)")
             continue
+        budget -= entry.size or 0
+        paths.append(entry.path)
+    return paths
 
-        seen_names.add(safe_name)
-        picked.append(
-            {
-                "url": f"./projects/{dest_root.name}/{safe_name}",
-                "caption": item.get("caption", "")[:140],
-            }
-        )
 
-    return picked
+def build_graphql_blob_query(repo, paths: List[str]) -> str:
+    owner, name = repo.full_name.split("/", 1)
+    branch = repo.default_branch or "main"
+    files = "\n".join(
+        f"    f{n}: object(expression: {json.dumps(f'{branch}:{path}')}) {{ ...BlobText }}"
+        for n, path in enumerate(paths)
+    )
+    return (
+        GRAPHQL_BLOB_FRAGMENT + "\n"
+        f"query {{\n  repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{\n{files}\n  }}\n}}"
+    )
+
+
+def fetch_docs(repo, paths: List[str]) -> List[Tuple[str, str]]:
+    """
+    (path, text) for each doc. Files not already in CONTENT_CACHE come in one GraphQL query
+    for the whole repo; anything that query could not provide falls back to REST, per file.
+    """
+    pending = CONTENT_CACHE.missing(repo, paths)
+    if len(pending) > 1:
+        data = graphql_query(build_graphql_blob_query(repo, pending))
+        node = (data or {}).get("repository") or {}
+        for n, path in enumerate(pending):
+            blob = node.get(f"f{n}")
+            if blob and (text := graphql_blob_text(blob)) is not None:
+                CONTENT_CACHE.put(repo, path, text)
+
+    docs = []
+    for path in paths:
+        text = get_file_content(repo, path)
+        if text:
+            docs.append((path, text))
+    return docs
 
 
 def build_context_section(repo, readme: str, docs_content: str) -> str:
@@ -340,12 +1559,659 @@ def build_context_section(repo, readme: str, docs_content: str) -> str:
     return "".join(context)
 
 
+# ============ Responsive Variants ============
+
+def render_variants(store_dir: Path, variant_dir: Path, name: str, formats: List[str]) -> Tuple[List[Tuple[str, int, str]], int]:
+    """
+    Runs in the process pool. Resizes one store image to each RESPONSIVE_WIDTHS entry below its
+    own width (plus its own width, capped at the largest) in every format given. Variant names
+    come from the source's content hash, so files already on disk are reused and only a new
+    blob gets rendered. Returns ([(format, width, file name)], number of files written).
+    """
+    source = store_dir / name
+    variants = []
+    written = 0
+    try:
+        with Image.open(source) as img:
+            widths = sorted({w for w in Config.RESPONSIVE_WIDTHS if w < img.width} | {min(img.width, max(Config.RESPONSIVE_WIDTHS))})
+            frame = None
+            for fmt in formats:
+                for width in widths:
+                    variant = variant_dir / f"{source.stem}.{width}w.{fmt}"
+                    if not variant.exists():
+                        if frame is None:
+                            frame = img.convert("RGBA" if img.has_transparency_data else "RGB")
+                        height = max(1, round(img.height * width / img.width))
+                        variant_dir.mkdir(parents=True, exist_ok=True)
+                        temp_path = variant_dir / f".{variant.name}.{os.getpid()}.tmp"
+                        options = {"speed": Config.AVIF_SPEED} if fmt == "avif" else {}
+                        frame.resize((width, height), Image.LANCZOS).save(temp_path, fmt.upper(), quality=Config.VARIANT_QUALITY, **options)
+                        temp_path.replace(variant)
+                        written += 1
+                    variants.append((fmt, width, variant.name))
+    except (OSError, ValueError, Image.DecompressionBombError) as exc:
+        print(f"    could not render variants for {name}: {exc}")
+        return [], written
+    return variants, written
+
+
+def attach_image_variants(projects: List[Dict]) -> int:
+    """
+    Give every store image a srcset of resized AVIF/WebP copies and point each project's thumb
+    at the smallest WebP of its first image. Returns the number of variant files written.
+    """
+    from PIL import features
+
+    formats = [fmt for fmt in Config.VARIANT_FORMATS if features.check(fmt)]
+    store_prefix = image_store_url("")
+    names = sorted({
+        image["url"][len(store_prefix):]
+        for project in projects
+        for image in project.get("images", [])
+        # Animated GIFs would lose their frames, and SVGs are already resolution independent
+        if image["url"].startswith(store_prefix) and not image["url"].endswith((".gif", ".svg"))
+    })
+    if not formats or not names:
+        return 0
+
+    # Fork where we can: all worker threads have finished by now, and a spawned child would
+    # re-run this script's token lookup on import
+    start_method = "fork" if "fork" in multiprocessing.get_all_start_methods() else None
+    with ProcessPoolExecutor(mp_context=multiprocessing.get_context(start_method)) as pool:
+        rendered = dict(zip(names, pool.map(
+            render_variants, repeat(IMAGE_STORE_DIR), repeat(IMAGE_VARIANTS_DIR), names, repeat(formats)
+        )))
+
+    for project in projects:
+        for image in project.get("images", []):
+            variants = rendered.get(image["url"][len(store_prefix):], ([], 0))[0]
+            srcset = [
+                {"url": image_store_url(f"{IMAGE_VARIANTS_DIR.name}/{file_name}"), "type": f"image/{fmt}", "width": width}
+                for fmt, width, file_name in variants
+            ]
+            if srcset:
+                image["srcset"] = srcset
+            else:
+                image.pop("srcset", None)
+        images = project.get("images") or []
+        if images and images[0].get("srcset"):
+            webp = [variant for variant in images[0]["srcset"] if variant["type"] == "image/webp"] or images[0]["srcset"]
+            project["thumb"] = min(webp, key=lambda variant: variant["width"])["url"]
+    return sum(written for _, written in rendered.values())
+
+
+# ============ Context Writer ============
+
+class ContextWriter:
+    """
+    Streams the projects context to disk one section at a time, in repo order, instead of
+    joining every README in memory. By default that is CONTEXT_FILE itself (via a temp file,
+    swapped in on success). In shard mode each repo gets its own file under CONTEXT_SHARDS_DIR,
+    rewritten only when its content changed, and CONTEXT_FILE becomes a small index of them.
+    """
+
+    HEADER = "# All Projects Context\n\nThis document contains details of all projects fetched from GitHub.\n\n"
+    SHARD_HEADER = "# All Projects Context\n\nOne file per project, so consumers can load only the projects they need.\n\n"
+
+    def __init__(self, path: Path, shards: bool):
+        self.path = path
+        self.shards = shards
+        self.shards_written = 0
+        self._shard_names = set()
+        self._temp_path = path.with_name(f"{path.name}.tmp")
+        self._file = open(self._temp_path, "w", encoding="utf-8")
+        self._file.write(self.SHARD_HEADER if shards else self.HEADER)
+
+    def __enter__(self) -> "ContextWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._file.close()
+        if exc_type is not None:
+            # Keep the previous context rather than a half-written one
+            self._temp_path.unlink(missing_ok=True)
+            return
+        self._temp_path.replace(self.path)
+        if self.shards:
+            for shard in CONTEXT_SHARDS_DIR.glob("*.md"):
+                if shard.name not in self._shard_names:
+                    shard.unlink()
+
+    def write(self, repo, display_name: str, section: str) -> None:
+        if not self.shards:
+            self._file.write(section)
+            return
+
+        name = f"{slugify(repo.full_name)}.md"
+        self._shard_names.add(name)
+        shard = CONTEXT_SHARDS_DIR / name
+        if not shard.exists() or shard.read_text(encoding="utf-8") != section:
+            CONTEXT_SHARDS_DIR.mkdir(parents=True, exist_ok=True)
+            temp_path = shard.with_suffix(".tmp")
+            temp_path.write_text(section, encoding="utf-8")
+            temp_path.replace(shard)
+            self.shards_written += 1
+        link = Path(os.path.relpath(shard, self.path.parent)).as_posix()
+        self._file.write(f"- [{display_name}]({link}) - `{repo.full_name}`\n")
+
+
+CONTEXT_SUBSECTION_RE = re.compile(r"^### (README|docs/[^\n]+)\n", re.MULTILINE)
+
+
+def split_context_section(section: str) -> List[Tuple[str, str]]:
+    """ (name, text) parts of one repo's section, as laid out by build_context_section. """
+    parts = CONTEXT_SUBSECTION_RE.split(section.rstrip().removesuffix("---"))
+    return [("overview", parts[0].strip()), *((name, text.strip()) for name, text in zip(parts[1::2], parts[2::2]))]
+
+
+class ContextIndex:
+    """
+    SQLite FTS5 index over the projects context, one row per repo sub-section (overview, README,
+    each doc), so evidence for a technology or phrase comes back ranked instead of grepped.
+    A repo whose section text is unchanged keeps its rows.
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(str(path))
+        self._db.executescript(
+            """
+            CREATE VIRTUAL TABLE IF NOT EXISTS sections USING fts5(
+                repo UNINDEXED, title, section, body, tokenize = 'porter unicode61'
+            );
+            CREATE TABLE IF NOT EXISTS indexed_repos (repo TEXT PRIMARY KEY, digest TEXT NOT NULL);
+            """
+        )
+        self.updated = 0
+
+    def update(self, repo, display_name: str, section: str) -> None:
+        digest = hashlib.sha256(f"{display_name}\n{section}".encode("utf-8")).hexdigest()
+        row = self._db.execute("SELECT digest FROM indexed_repos WHERE repo = ?", (repo.full_name,)).fetchone()
+        if row and row[0] == digest:
+            return
+        self._db.execute("DELETE FROM sections WHERE repo = ?", (repo.full_name,))
+        self._db.executemany(
+            "INSERT INTO sections (repo, title, section, body) VALUES (?, ?, ?, ?)",
+            [(repo.full_name, display_name, name, text) for name, text in split_context_section(section) if text],
+        )
+        self._db.execute("INSERT OR REPLACE INTO indexed_repos VALUES (?, ?)", (repo.full_name, digest))
+        self.updated += 1
+
+    def __enter__(self) -> "ContextIndex":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # Uncommitted rows from a failed run are rolled back, leaving the previous index
+        self._db.close()
+
+    def finish(self, repo_names: set) -> None:
+        """ Drop repos that are no longer in the context, compact the index and commit. """
+        for (name,) in self._db.execute("SELECT repo FROM indexed_repos").fetchall():
+            if name not in repo_names:
+                self._db.execute("DELETE FROM sections WHERE repo = ?", (name,))
+                self._db.execute("DELETE FROM indexed_repos WHERE repo = ?", (name,))
+        if self.updated:
+            self._db.execute("INSERT INTO sections (sections) VALUES ('optimize')")
+        self._db.commit()
+
+
+def open_context_index():
+    """ ContextIndex on CONTEXT_INDEX_FILE, or a stand-in yielding None when SQLite lacks FTS5. """
+    try:
+        return ContextIndex(CONTEXT_INDEX_FILE)
+    except sqlite3.OperationalError as exc:
+        print(f"Full-text index disabled ({exc}).")
+        return nullcontext()
+
+
+# ============ Incremental Sync ============
+
+
+def load_sync_manifest() -> Dict[str, Dict]:
+    if not SYNC_MANIFEST_FILE.exists():
+        return {}
+    try:
+        return json.loads(SYNC_MANIFEST_FILE.read_text(encoding="utf-8")).get("repos", {})
+    except json.JSONDecodeError:
+        return {}
+
+
+def save_sync_manifest(entries: Dict[str, Dict]) -> None:
+    write_json_atomic(SYNC_MANIFEST_FILE, {"repos": entries})
+
+
+def section_path(repo) -> Path:
+    return SECTIONS_DIR / f"{slugify(repo.full_name)}.md"
+
+
+def pushed_at_unchanged(repo, previous: Optional[Dict]) -> bool:
+    pushed_at = repo.pushed_at.isoformat() if repo.pushed_at else ""
+    return bool(previous) and previous.get("pushed_at") == pushed_at
+
+
+def read_head(repo, from_snapshot: bool) -> Tuple[str, str]:
+    """
+    (head commit SHA, tree SHA) of the default branch; empty strings for empty repos. With
+    from_snapshot the tree SHA comes off the snapshot, which the display name needs anyway, and
+    the head SHA is left empty instead of costing a get_branch call.
+    """
+    prefetched = GRAPHQL_PREFETCH.get(repo.full_name)
+    if prefetched:
+        return prefetched["head_sha"], prefetched["tree_sha"]
+    if from_snapshot:
+        return "", get_snapshot(repo).sha
+    try:
+        branch = repo.get_branch(repo.default_branch or "main")
+        return branch.commit.sha, branch.commit.commit.tree.sha
+    except GithubException:
+        return "", ""
+
+
+def identify_repo(repo, previous: Optional[Dict], incremental: bool) -> Dict:
+    """
+    Sync manifest entry for a repo. In incremental mode an unchanged pushed_at costs no
+    request at all, and a moved pushed_at with the same tree SHA (e.g. a push to another branch)
+    costs one. Anywhere else the tree SHA costs nothing beyond the snapshot.
+    """
+    pushed_at = repo.pushed_at.isoformat() if repo.pushed_at else ""
+    if incremental and pushed_at_unchanged(repo, previous):
+        return {**previous, "unchanged": True}
+
+    # Only a comparison with last run is worth a get_branch; it can spare the whole tree fetch
+    head_sha, tree_sha = read_head(repo, from_snapshot=not (incremental and previous))
+    if incremental and previous and tree_sha and previous.get("tree_sha") == tree_sha:
+        return {**previous, "pushed_at": pushed_at, "head_sha": head_sha, "unchanged": True}
+
+    return {
+        "pushed_at": pushed_at,
+        "head_sha": head_sha,
+        "tree_sha": tree_sha,
+        "display_name": derive_display_name(repo),
+        "unchanged": False,
+    }
+
+
+# ============ GraphQL Prefetch ============
+
+# Every file derive_display_name and the context section may read, fetched up front in --graphql mode
+GRAPHQL_PREFETCH_PATHS = (
+    "README.md",
+    "package.json",
+    "app.json",
+    "pubspec.yaml",
+    "app/src/main/res/values/strings.xml",
+    "android/app/src/main/res/values/strings.xml",
+)
+
+# full_name -> {"topics", "head_sha", "tree_sha", "docs"}; repos missing here use the REST path
+GRAPHQL_PREFETCH: Dict[str, Dict] = {}
+
+# Blob.text is cut off for large files; isTruncated tells us to leave those to REST
+GRAPHQL_BLOB_FRAGMENT = "fragment BlobText on Blob { text isBinary isTruncated }"
+
+
+def graphql_blob_text(blob: Dict) -> Optional[str]:
+    """ The complete text of a BlobText result, or None when it is binary, truncated or missing. """
+    if blob.get("isBinary") or blob.get("isTruncated"):
+        return None
+    return blob.get("text")
+
+
+def graphql_query(query: str) -> Optional[Dict]:
+    try:
+        response = get_http_session().post(
+            GITHUB_GRAPHQL_URL,
+            json={"query": query},
+            headers={"Authorization": f"bearer {GITHUB_TOKEN}"},
+            timeout=Config.REQUEST_TIMEOUT * 3,
+        )
+    except requests.RequestException as exc:
+        print(f"    GraphQL request failed: {exc}")
+        return None
+    if response.status_code != 200:
+        print(f"    GraphQL request failed with HTTP {response.status_code}")
+        return None
+    payload = response.json()
+    if payload.get("errors") and not payload.get("data"):
+        print(f"    GraphQL errors: {payload['errors'][0].get('message')}")
+        return None
+    return payload.get("data")
+
+
+def build_graphql_batch_query(repos: List) -> str:
+    blocks = []
+    for index, repo in enumerate(repos):
+        owner, name = repo.full_name.split("/", 1)
+        branch = repo.default_branch or "main"
+        files = "\n".join(
+            f"    f{n}: object(expression: {json.dumps(f'{branch}:{path}')}) {{ ...BlobText }}"
+            for n, path in enumerate(GRAPHQL_PREFETCH_PATHS)
+        )
+        blocks.append(
+            f"""  r{index}: repository(owner: {json.dumps(owner)}, name: {json.dumps(name)}) {{
+    repositoryTopics(first: 20) {{ nodes {{ topic {{ name }} }} }}
+    defaultBranchRef {{ target {{ ... on Commit {{ oid tree {{ oid }} }} }} }}
+{files}
+    docs: object(expression: {json.dumps(f'{branch}:docs')}) {{
+      ... on Tree {{ entries {{ name path type oid object {{ ...BlobText ... on Blob {{ byteSize }} }} }} }}
+    }}
+  }}"""
+        )
+    return GRAPHQL_BLOB_FRAGMENT + "\nquery {\n" + "\n".join(blocks) + "\n}"
+
+
+def apply_graphql_batch(repos: List, data: Dict) -> None:
+    for index, repo in enumerate(repos):
+        node = data.get(f"r{index}")
+        if not node:
+            continue
+
+        for n, path in enumerate(GRAPHQL_PREFETCH_PATHS):
+            blob = node.get(f"f{n}")
+            if blob is None:
+                CONTENT_CACHE.put(repo, path, None)
+            elif (text := graphql_blob_text(blob)) is not None:
+                CONTENT_CACHE.put(repo, path, text)
+
+        # Top-level docs come along for free; the snapshot still lists nested ones, and this
+        # listing stands in for it when the tree fetch fails or is truncated
+        docs = []
+        for entry in (node.get("docs") or {}).get("entries", []):
+            if entry.get("type") != "blob" or not entry["name"].endswith(".md"):
+                continue
+            blob = entry.get("object") or {}
+            docs.append(TreeEntry(entry["path"], blob.get("byteSize"), entry.get("oid", ""), "blob"))
+            text = graphql_blob_text(blob)
+            if text is not None:
+                CONTENT_CACHE.put(repo, entry["path"], text)
+
+        target = (node.get("defaultBranchRef") or {}).get("target") or {}
+        GRAPHQL_PREFETCH[repo.full_name] = {
+            "topics": [t["topic"]["name"] for t in (node.get("repositoryTopics") or {}).get("nodes", [])],
+            "head_sha": target.get("oid", ""),
+            "tree_sha": (target.get("tree") or {}).get("oid", ""),
+            "docs": docs,
+        }
+
+
+def prefetch_graphql(repos: List, pool: ThreadPoolExecutor) -> None:
+    """
+    Fill CONTENT_CACHE and GRAPHQL_PREFETCH for many repos per query. A failed batch is
+    just left out, and those repos fall back to per-repo REST calls.
+    """
+    batches = [repos[i:i + Config.GRAPHQL_BATCH_SIZE] for i in range(0, len(repos), Config.GRAPHQL_BATCH_SIZE)]
+
+    def run_batch(batch: List) -> None:
+        data = graphql_query(build_graphql_batch_query(batch))
+        if data:
+            apply_graphql_batch(batch, data)
+
+    list(pool.map(run_batch, batches))
+    print(f"GraphQL prefetch: {len(GRAPHQL_PREFETCH)} of {len(repos)} repositories in {len(batches)} queries.")
+
+
+# ============ Checkpoint Journal ============
+
+class RunJournal:
+    """
+    Append-only JSONL checkpoint of finished per-repo work (identity, details, inherited images).
+    Each entry is flushed as soon as its repo finishes; a crashed or rate-limited run restarted
+    with --resume replays the journal instead of refetching those repos.
+    """
+
+    KINDS = ("identity", "details", "inherit")
+
+    def __init__(self, path: Path, resume: bool):
+        self.path = path
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Dict[str, object]] = {kind: {} for kind in self.KINDS}
+        if resume and path.exists():
+            for line in path.read_text(encoding="utf-8").splitlines():
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    break  # torn final line from the crash
+                self._entries[entry["kind"]][entry["repo"]] = entry["value"]
+
+        # Rewrite only the valid entries so new appends never follow a torn line
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._file = open(path, "w", encoding="utf-8")
+        for kind, entries in self._entries.items():
+            for repo, value in entries.items():
+                self._write(kind, repo, value)
+        self._file.flush()
+
+    def _write(self, kind: str, repo: str, value) -> None:
+        self._file.write(json.dumps({"kind": kind, "repo": repo, "value": value}) + "\n")
+
+    def __len__(self) -> int:
+        return len(self._entries["details"])
+
+    def replayed(self, kind: str, repo: str):
+        with self._lock:
+            return self._entries[kind].get(repo)
+
+    def record(self, kind: str, repo: str, value) -> None:
+        # Written, not kept: a repo is always looked up before it is recorded, and holding every
+        # README here would undo the streaming context writer
+        with self._lock:
+            self._write(kind, repo, value)
+            self._file.flush()
+
+    def finish(self) -> None:
+        """ The run's outputs are written; nothing left to resume. """
+        self._file.close()
+        self.path.unlink(missing_ok=True)
+
+
 # ============ Main Logic ============
 
 
+def apply_custom_captions(display_name: str, images: List[Dict]) -> None:
+    """
+    Re-apply our custom AI captions for the flagship apps.
+    Store file names are content hashes, so match on the image's path in its repo when we have it.
+    """
+    if display_name == "portfolio-moi":
+         for i, img in enumerate(images):
+             ref = img.get("path") or img["url"]
+             if "habit_dashboard" in ref: img["caption"] = "Main dashboard showing weekly habit streaks with a beautiful glassmorphism card layout."
+             elif "habit_stats" in ref: img["caption"] = "Analytics view displaying habit completion percentages using sleek circular progress UI elements."
+             elif "overlay" in ref: img["caption"] = "In-page Chrome extension overlay analyzing live product listing keywords."
+             elif "popup" in ref: img["caption"] = "Chrome extension popup interface displaying the keyword SEO score."
+             elif "smshook" in ref: img["caption"] = "LSPosed module configuration screen with stealth and append toggles."
+             elif "profile" in ref: img["caption"] = "A glowing cyber-teal sphere emphasizing the developer's profile picture."
+    elif "49Blox" in display_name and "Platform" in display_name:
+         for i, img in enumerate(images):
+             ref = img.get("path") or img["url"]
+             if i == 0: img["caption"] = "Platform dashboard displaying digital music collectibles and ownership stakes."
+             elif i == 1: img["caption"] = "Primary orderbook and pricing graph for a tokenized song."
+             elif i == 2: img["caption"] = "Secondary marketplace view where users can trade their music asset shares."
+             elif "Team" in ref: img["caption"] = "About us section highlighting the development team."
+    elif "JsonExport" in display_name:
+         for i, img in enumerate(images):
+             ref = img.get("path") or img["url"]
+             if "hero" in ref: img["caption"] = "JsonExport Banner showcasing the primary value proposition."
+             elif "batch" in ref or "edits" in ref: img["caption"] = "Data Grid UI visualizing the parsed and flattened JSON arrays."
+             elif "open" in ref: img["caption"] = "Export panel showing options for CSV, Excel, HTML, and ZIP downloads."
+    elif "Product Listing Optimizer" in display_name:
+         for i, img in enumerate(images):
+             ref = img.get("path") or img["url"]
+             if "og-" in ref: img["caption"] = "Product Listing Optimizer promotional banner."
+             elif "large" in ref: img["caption"] = "Chrome Web Store large promotional graphic demonstrating the grading functionality."
+             elif "small" in ref: img["caption"] = "Chrome Web Store small promo banner."
+    elif display_name == "OIT  Online Educational Tool":
+         for i, img in enumerate(images):
+             ref = img.get("path") or img["url"]
+             if "739247" in ref: img["caption"] = "Educational Portal landing and portal interface."
+    elif display_name == "Coddle":
+         for i, img in enumerate(images):
+             ref = img.get("path") or img["url"]
+             if "initial" in ref: img["caption"] = "The initial state of the Coddle game board showing empty tiles ready for user input."
+             elif "wrong" in ref: img["caption"] = "Gameplay view demonstrating the color-coded feedback when an incorrect guess is submitted."
+             elif "win" in ref: img["caption"] = "Victory modal displaying the user's statistics, streak, and a shareable summary after guessing the correct coding term."
+    elif display_name == "Offline Habit Tracker":
+         for i, img in enumerate(images):
+             ref = img.get("path") or img["url"]
+             if "screenshot" in ref: img["caption"] = "Main interface of the offline Habit Tracker showing daily progress."
+
+
+def fetch_repo_details(repo, display_name: str) -> Dict:
+    """
+    All network work for one primary repo. Runs on a worker thread and only returns data;
+    merging into project_map happens on the main thread in repo order.
+    """
+    print(f"Processing: {str(display_name).encode('ascii', 'ignore').decode('ascii')} ({repo.full_name})")
+
+    prefetched = GRAPHQL_PREFETCH.get(repo.full_name, {})
+    topics = prefetched["topics"] if "topics" in prefetched else repo.get_topics()
+    readme = get_file_content(repo, "README.md") or ""
+
+    # Aggregate docs content
+    doc_paths = select_doc_paths(list_doc_entries(repo), skip=own_output_paths(repo))
+    docs_content = "".join(f"\n### {doc_path}\n{file_text}\n" for doc_path, file_text in fetch_docs(repo, doc_paths))
+
+    # Discover and download images
+    candidates = discover_image_candidates(repo)
+    downloaded = download_images(repo, candidates)
+    print(f"  {repo.full_name}: found {len(candidates)} image candidates, downloaded {len(downloaded)} images")
+
+    return {
+        "topics": topics,
+        "context": build_context_section(repo, readme, docs_content),
+        "images": downloaded,
+    }
+
+
+def inherit_duplicate_images(primary_project: Dict, duplicate_repos: List) -> None:
+    """
+    If the primary repo we saved didn't get images, fill its slots from the skipped duplicates (in repo order).
+    Copies of a repo tend to ship the same screenshots, so pictures already inherited from an earlier one are skipped.
+    """
+    if primary_project.get("images"):
+        return
+    inherited: List[Dict] = []
+    for repo in duplicate_repos:
+        if len(inherited) >= Config.MAX_IMAGES_PER_REPO:
+            break
+        candidates = discover_image_candidates(repo)
+        downloaded = download_images(repo, candidates, taken=inherited)
+        if downloaded:
+            print(f"  -> Inherited {len(downloaded)} images from skipped duplicate repo {repo.full_name}.")
+            inherited.extend(downloaded)
+    if inherited:
+        primary_project["images"] = inherited
+        primary_project["thumb"] = inherited[0]["url"]
+
+
+def merge_project(repo, display_name: str, details: Dict, project_map: Dict[str, Dict]) -> Dict:
+    topics = details["topics"]
+    language = repo.language or "Unspecified"
+    category = "web"
+    topic_lower = [str(t).lower() for t in topics]
+    if "android" in topic_lower or "kotlin" in topic_lower or (language and language.lower() == "kotlin"):
+        category = "mobile"
+
+    tags = list({language} | set(topics[:3]))
+
+    # Match existing project if present
+    project_data = project_map.get(repo.html_url) or project_map.get(repo.full_name) or project_map.get(repo.name)
+
+    if not project_data:
+        project_data = {
+            "id": repo.id,
+            "title": display_name,
+            "category": category,
+            "tags": tags,
+            "description": repo.description or "No description provided.",
+            "details": "Imported from GitHub. See README for details.",
+            "link": repo.html_url,
+            "images": [],
+            "thumb": "",
+        }
+    else:
+        project_data["title"] = display_name
+        project_data["description"] = repo.description or project_data.get("description", "")
+        project_data["link"] = repo.html_url
+        project_data["tags"] = list(set(project_data.get("tags", []) + tags))
+        project_data.setdefault("details", "Imported from GitHub. See README for details.")
+        project_data.setdefault("images", [])
+        project_data.setdefault("thumb", "")
+
+    downloaded = details["images"]
+    if downloaded:
+        project_data["images"] = downloaded
+        project_data["thumb"] = downloaded[0]["url"]
+        apply_custom_captions(display_name, project_data["images"])
+    elif not Config.PRESERVE_IF_NO_NEW_IMAGES:
+        project_data["images"] = []
+        project_data["thumb"] = ""
+
+    return project_data
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Sync GitHub repositories into projects.json and the projects context file.")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=Config.WORKERS,
+        help="Number of repositories processed concurrently (output does not depend on it).",
+    )
+    parser.add_argument(
+        "--incremental",
+        action="store_true",
+        help="Reuse the previous result for repos whose pushed_at or tree SHA has not changed.",
+    )
+    parser.add_argument(
+        "--graphql",
+        action="store_true",
+        help="Prefetch topics, READMEs, manifests and docs for many repos per GraphQL query (REST fills any gaps).",
+    )
+    parser.add_argument(
+        "--resume",
+        action="store_true",
+        help="Continue an interrupted run from its checkpoint journal instead of starting over.",
+    )
+    parser.add_argument(
+        "--context-shards",
+        action="store_true",
+        help="Write one context file per repo under docs/projects/ and make ALL_PROJECTS_CONTEXT.md an index of them.",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Skip the on-disk HTTP cache and send unconditional requests.",
+    )
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    return args
+
+
 def main():
+    global HTTP_CACHE, BLOB_INDEX, PERCEPTUAL_INDEX, ASYNC_DOWNLOADER
+    args = parse_args()
+    BLOB_INDEX = BlobIndex(CACHE_DIR / "blob_index.json")
+    if Image is not None:
+        PERCEPTUAL_INDEX = PerceptualIndex(CACHE_DIR / "phash_index.json")
+    else:
+        print("numpy/Pillow not installed; skipping near-duplicate detection and responsive variants.")
+    if httpx is not None:
+        ASYNC_DOWNLOADER = AsyncImageDownloader()
+    else:
+        print("httpx not installed; downloading images one at a time.")
+    if not args.no_cache:
+        HTTP_CACHE = HTTPCache(CACHE_DIR / "http_cache.sqlite")
+
     print("Authenticating with GitHub...")
-    gh = Github(GITHUB_TOKEN)
+    gh = Github(
+        GITHUB_TOKEN,
+        base_url=GITHUB_API_URL,
+        pool_size=Config.HTTP_POOL_SIZE,
+        seconds_between_requests=Config.SECONDS_BETWEEN_REQUESTS,
+        retry=None,  # PooledHTTPSConnection ignores it anyway; retries live in the session adapter
+    )
     user = gh.get_user()
     print(f"Logged in as: {user.login}")
 
@@ -368,146 +2234,159 @@ def main():
 
     repos = list(user.get_repos(type="all", sort="updated", direction="desc"))
     print(f"Discovered {len(repos)} total repositories before filtering.")
-    context_content = ["# All Projects Context\n\nThis document contains details of all projects fetched from GitHub.\n\n"]
+    repos = [repo for repo in repos if not repo.fork]
     new_projects: List[Dict] = []
     seen_titles = {}
+    previous_manifest = load_sync_manifest()
+    manifest: Dict[str, Dict] = {}
+    journal = RunJournal(JOURNAL_FILE, resume=args.resume)
+    if args.resume:
+        print(f"Resuming: {len(journal)} repositories already finished in {JOURNAL_FILE}.")
+
+    def identify(repo) -> Dict:
+        identity = journal.replayed("identity", repo.full_name)
+        if identity is None:
+            identity = identify_repo(repo, previous_manifest.get(repo.full_name), args.incremental)
+            journal.record("identity", repo.full_name, identity)
+        return dict(identity)
+
+    def fetch(repo, display_name: str) -> Dict:
+        details = journal.replayed("details", repo.full_name)
+        if details is None:
+            details = fetch_repo_details(repo, display_name)
+            journal.record("details", repo.full_name, details)
+        release_snapshots([repo.full_name])
+        return details
+
+    def inherit(primary, primary_project: Dict, duplicate_repos: List) -> None:
+        images = journal.replayed("inherit", primary.full_name)
+        if images is None:
+            inherit_duplicate_images(primary_project, duplicate_repos)
+            journal.record("inherit", primary.full_name, primary_project.get("images") or [])
+        elif images:
+            primary_project["images"] = images
+            primary_project["thumb"] = images[0]["url"]
+        release_snapshots([repo.full_name for repo in duplicate_repos])
+
+    with ThreadPoolExecutor(max_workers=args.workers) as pool:
+        if args.graphql:
+            prefetch_graphql(
+                [
+                    repo for repo in repos
+                    if not (args.incremental and pushed_at_unchanged(repo, previous_manifest.get(repo.full_name)))
+                    and journal.replayed("details", repo.full_name) is None
+                ],
+                pool,
+            )
+
+        # Pass 1: display names decide which repo is the primary for a title, in repo order
+        identities = list(pool.map(identify, repos))
+        changed = {repo.full_name for repo, identity in zip(repos, identities) if not identity.pop("unchanged")}
+        for repo, identity in zip(repos, identities):
+            manifest[repo.full_name] = identity
+        if args.incremental:
+            print(f"Incremental sync: {len(changed)} of {len(repos)} repositories changed.")
+
+        primaries = []
+        duplicates: Dict[str, List] = {}
+        for repo, identity in zip(repos, identities):
+            display_name = identity["display_name"]
+            normalized = normalize_title(display_name)
+            if normalized in duplicates:
+                print(f"- Skipping duplicate title: {str(display_name).encode('ascii', 'ignore').decode('ascii')}")
+                duplicates[normalized].append(repo)
+                continue
+            duplicates[normalized] = []
+            primaries.append((repo, display_name, normalized))
 
-    for repo in repos:
-        if repo.fork:
-            continue
-
-        display_name = derive_display_name(repo)
-        normalized = normalize_title(display_name)
-
-        if normalized in seen_titles:
-            print(f"- Skipping duplicate title: {str(display_name).encode('ascii', 'ignore').decode('ascii')}")
-            # If the duplicate we are skipping has images, and the primary repo we saved earlier didn't, inherit its images.
-            primary_project = seen_titles[normalized]
-            if not primary_project.get("images"):
-                dest_dir = PROJECTS_ASSET_DIR / slugify(primary_project.get("title", repo.name))
-                candidates = discover_image_candidates(repo)
-                downloaded = download_images(repo, candidates, dest_dir)
-                if downloaded:
-                    print(f"  -> Inherited {len(downloaded)} images from skipped duplicate repo.")
-                    primary_project["images"] = downloaded
-                    primary_project["thumb"] = downloaded[0]["url"]
-            continue
-
-        print(f"Processing: {str(display_name).encode('ascii', 'ignore').decode('ascii')} ({repo.full_name})")
-
-        topics = repo.get_topics()
-        language = repo.language or "Unspecified"
-        category = "web"
-        topic_lower = [str(t).lower() for t in topics]
-        if "android" in topic_lower or "kotlin" in topic_lower or (language and language.lower() == "kotlin"):
-            category = "mobile"
-
-        tags = list({language} | set(topics[:3]))
-
-        readme = get_file_content(repo, "README.md") or ""
-
-        # Aggregate docs content
-        docs_content = ""
-        try:
-            contents = repo.get_contents("docs")
-            for content_file in contents:
-                if content_file.name.endswith(".md"):
-                    file_text = get_file_content(repo, content_file.path)
-                    if file_text:
-                        docs_content += f"\n### docs/{content_file.name}\n{file_text}\n"
-        except GithubException:
-            pass
-
-        context_content.append(build_context_section(repo, readme, docs_content))
-
-        # Match existing project if present
-        project_data = project_map.get(repo.html_url) or project_map.get(repo.full_name) or project_map.get(repo.name)
-
-        if not project_data:
-            project_data = {
-                "id": repo.id,
-                "title": display_name,
-                "category": category,
-                "tags": tags,
-                "description": repo.description or "No description provided.",
-                "details": "Imported from GitHub. See README for details.",
-                "link": repo.html_url,
-                "images": [],
-                "thumb": "",
-            }
-        else:
-            project_data["title"] = display_name
-            project_data["description"] = repo.description or project_data.get("description", "")
-            project_data["link"] = repo.html_url
-            project_data["tags"] = list(set(project_data.get("tags", []) + tags))
-            project_data.setdefault("details", "Imported from GitHub. See README for details.")
-            project_data.setdefault("images", [])
-            project_data.setdefault("thumb", "")
-
-        # Discover and download images
-        dest_dir = PROJECTS_ASSET_DIR / slugify(repo.name)
-        candidates = discover_image_candidates(repo)
-        print(f"  found {len(candidates)} image candidates")
-        downloaded = download_images(repo, candidates, dest_dir)
-        print(f"  downloaded {len(downloaded)} images")
-
-        if downloaded:
-            project_data["images"] = downloaded
-            project_data["thumb"] = downloaded[0]["url"]
-            
-            # Re-apply our custom AI captions for the flagship apps
-            if display_name == "portfolio-moi":
-                 for i, img in enumerate(project_data["images"]):
-                     if "habit_dashboard" in img["url"]: img["caption"] = "Main dashboard showing weekly habit streaks with a beautiful glassmorphism card layout."
-                     elif "habit_stats" in img["url"]: img["caption"] = "Analytics view displaying habit completion percentages using sleek circular progress UI elements."
-                     elif "overlay" in img["url"]: img["caption"] = "In-page Chrome extension overlay analyzing live product listing keywords."
-                     elif "popup" in img["url"]: img["caption"] = "Chrome extension popup interface displaying the keyword SEO score."
-                     elif "smshook" in img["url"]: img["caption"] = "LSPosed module configuration screen with stealth and append toggles."
-                     elif "profile" in img["url"]: img["caption"] = "A glowing cyber-teal sphere emphasizing the developer's profile picture."
-            elif "49Blox" in display_name and "Platform" in display_name:
-                 for i, img in enumerate(project_data["images"]):
-                     if i == 0: img["caption"] = "Platform dashboard displaying digital music collectibles and ownership stakes."
-                     elif i == 1: img["caption"] = "Primary orderbook and pricing graph for a tokenized song."
-                     elif i == 2: img["caption"] = "Secondary marketplace view where users can trade their music asset shares."
-                     elif "Team" in img["url"]: img["caption"] = "About us section highlighting the development team."
-            elif "JsonExport" in display_name:
-                 for i, img in enumerate(project_data["images"]):
-                     if "hero" in img["url"]: img["caption"] = "JsonExport Banner showcasing the primary value proposition."
-                     elif "batch" in img["url"] or "edits" in img["url"]: img["caption"] = "Data Grid UI visualizing the parsed and flattened JSON arrays."
-                     elif "open" in img["url"]: img["caption"] = "Export panel showing options for CSV, Excel, HTML, and ZIP downloads."
-            elif "Product Listing Optimizer" in display_name:
-                 for i, img in enumerate(project_data["images"]):
-                     if "og-" in img["url"]: img["caption"] = "Product Listing Optimizer promotional banner."
-                     elif "large" in img["url"]: img["caption"] = "Chrome Web Store large promotional graphic demonstrating the grading functionality."
-                     elif "small" in img["url"]: img["caption"] = "Chrome Web Store small promo banner."
-            elif display_name == "OIT  Online Educational Tool":
-                 for i, img in enumerate(project_data["images"]):
-                     if "739247" in img["url"]: img["caption"] = "Educational Portal landing and portal interface."
-            elif display_name == "Coddle":
-                 for i, img in enumerate(project_data["images"]):
-                     if "initial" in img["url"]: img["caption"] = "The initial state of the Coddle game board showing empty tiles ready for user input."
-                     elif "wrong" in img["url"]: img["caption"] = "Gameplay view demonstrating the color-coded feedback when an incorrect guess is submitted."
-                     elif "win" in img["url"]: img["caption"] = "Victory modal displaying the user's statistics, streak, and a shareable summary after guessing the correct coding term."
-            elif display_name == "Offline Habit Tracker":
-                 for i, img in enumerate(project_data["images"]):
-                     if "screenshot" in img["url"]: img["caption"] = "Main interface of the offline Habit Tracker showing daily progress."
-            
-        elif not downloaded and not Config.PRESERVE_IF_NO_NEW_IMAGES:
-            project_data["images"] = []
-            project_data["thumb"] = ""
-
-        seen_titles[normalized] = project_data
-        new_projects.append(project_data)
-
-    # Write context
-    CONTEXT_FILE.write_text("".join(context_content), encoding="utf-8")
-    print(f"Saved context to {CONTEXT_FILE}")
+        # Unchanged primaries keep last run's project entry, context section and images as-is
+        reused: Dict[str, Dict] = {}
+        for repo, _, _ in primaries:
+            if repo.full_name in changed or not section_path(repo).exists():
+                continue
+            previous_project = project_map.get(repo.html_url) or project_map.get(repo.full_name) or project_map.get(repo.name)
+            if previous_project:
+                reused[repo.full_name] = previous_project
+        release_snapshots(reused)
+
+        # Pass 2: fetch primaries concurrently; merge and stream each section out in repo order
+        # as soon as it is ready. At most two fetches per worker are submitted ahead of the
+        # writer, so finished-but-unwritten details stay bounded however many repos there are
+        to_fetch = iter([item for item in primaries if item[0].full_name not in reused])
+        in_flight = deque()
+
+        def top_up() -> None:
+            while len(in_flight) < args.workers * 2:
+                item = next(to_fetch, None)
+                if item is None:
+                    return
+                in_flight.append(pool.submit(fetch, item[0], item[1]))
+
+        top_up()
+        with ContextWriter(CONTEXT_FILE, shards=args.context_shards) as context_writer, open_context_index() as context_index:
+            for repo, display_name, normalized in primaries:
+                if repo.full_name in reused:
+                    project_data = reused[repo.full_name]
+                    section = section_path(repo).read_text(encoding="utf-8")
+                else:
+                    repo_details = in_flight.popleft().result()
+                    top_up()
+                    section = repo_details["context"]
+                    SECTIONS_DIR.mkdir(parents=True, exist_ok=True)
+                    section_path(repo).write_text(section, encoding="utf-8")
+                    project_data = merge_project(repo, display_name, repo_details, project_map)
+                context_writer.write(repo, display_name, section)
+                if context_index is not None:
+                    context_index.update(repo, display_name, section)
+                seen_titles[normalized] = project_data
+                new_projects.append(project_data)
+            if context_index is not None:
+                context_index.finish({repo.full_name for repo, _, _ in primaries})
+                print(f"Indexed {context_index.updated} changed repositories in {CONTEXT_INDEX_FILE}.")
+        print(f"Saved context to {CONTEXT_FILE}")
+        if args.context_shards:
+            print(f"  {context_writer.shards_written} of {len(primaries)} shards in {CONTEXT_SHARDS_DIR} rewritten.")
+
+        # Pass 3: primaries still without images inherit from their skipped duplicates
+        orphans = [
+            (primary, seen_titles[normalized], duplicates[normalized])
+            for (primary, _, normalized) in primaries
+            if duplicates[normalized] and not seen_titles[normalized].get("images")
+            and ({primary.full_name} | {repo.full_name for repo in duplicates[normalized]}) & changed
+        ]
+        # Only the duplicates of these orphans are read again; their snapshots go once inherited
+        needed = {repo.full_name for _, _, duplicate_repos in orphans for repo in duplicate_repos}
+        release_snapshots([repo.full_name for group in duplicates.values() for repo in group if repo.full_name not in needed])
+        list(pool.map(lambda item: inherit(*item), orphans))
+
+    if ASYNC_DOWNLOADER is not None:
+        ASYNC_DOWNLOADER.close()
+    if Image is not None:
+        written = attach_image_variants(new_projects)
+        print(f"Responsive variants: {written} files rendered.")
 
     # Write JSON
     with open(DATA_FILE, "w", encoding="utf-8") as f:
         json.dump(new_projects, f, indent=2)
     print(f"Updated {DATA_FILE} with {len(new_projects)} projects.")
 
+    removed = collect_image_garbage(new_projects)
+    if removed:
+        print(f"Removed {removed} unreferenced images from {IMAGE_STORE_DIR}.")
+    BLOB_INDEX.save()
+    if PERCEPTUAL_INDEX is not None:
+        PERCEPTUAL_INDEX.save()
+    print(f"Blob index: {BLOB_INDEX.reused} images linked from the store without downloading.")
+
+    save_sync_manifest(manifest)
+    journal.finish()
+    print(f"Content cache: {CONTENT_CACHE.fetches} files fetched, {CONTENT_CACHE.hits} repeat reads served from cache.")
+    if HTTP_CACHE is not None:
+        print(f"HTTP cache: {HTTP_CACHE.revalidated} responses revalidated (304), {HTTP_CACHE.stored} stored.")
+        HTTP_CACHE.close()
+    print("Rate limit budget:")
+    print(SCHEDULER.report())
+
 
 if __name__ == "__main__":
     main()
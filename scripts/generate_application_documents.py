@@ -1,10 +1,22 @@
 from __future__ import annotations
 
 import argparse
+import fnmatch
+import hashlib
+import json
+import os
 import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from importlib import metadata
+from io import BytesIO
 from pathlib import Path
+from typing import NamedTuple
+from xml.sax.saxutils import escape, quoteattr
 
 from docx import Document
+from docx.enum.style import WD_STYLE_TYPE
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from docx.oxml import OxmlElement
 from docx.oxml.ns import qn
@@ -16,9 +28,12 @@ from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
 from reportlab.lib.units import inch
 from reportlab.platypus import HRFlowable, Paragraph, SimpleDocTemplate, Spacer
 
+from atomic_files import write_json_atomic
+
 
 ROOT = Path(__file__).resolve().parents[1]
 PUBLIC = ROOT / "public"
+BUILD_MANIFEST_FILE = ROOT / ".cache" / "generate_application_documents" / "build_manifest.json"
 
 PRESETS = {
     "access_bank_software_engineer": {
@@ -44,16 +59,176 @@ PRESETS = {
 }
 
 
-LINK_RE = re.compile(r"\[([^\]]+)\]\(([^)]+)\)")
-BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+# One alternation for every inline construct, so a line is scanned once: a ** bold toggle or a [label](url) link
+INLINE_RE = re.compile(r"\*\*|\[([^\]]+)\]\(([^)]+)\)")
+META_LABELS = ("Live:", "GitHub:")  # a line opening with one of these in bold (or "| **GitHub:**") is a link line
 ACCENT = RGBColor(27, 54, 93)
 ACCENT_HEX = "#1B365D"
+ACCENT_COLOR = colors.HexColor(ACCENT_HEX)
+
+# Named paragraph styles baked into the DOCX template; runs only carry text (and the Strong style)
+DOCX_STYLES = {
+    "Resume Name": dict(size=18, bold=True, color=ACCENT, alignment=WD_ALIGN_PARAGRAPH.CENTER, space_after=2),
+    "Resume Title": dict(size=11.5, bold=True, color=RGBColor(68, 68, 68), alignment=WD_ALIGN_PARAGRAPH.CENTER, space_after=4),
+    "Resume Header": dict(size=9.5, color=RGBColor(55, 55, 55), alignment=WD_ALIGN_PARAGRAPH.CENTER, space_after=2),
+    "Resume Divider": dict(space_before=2, space_after=7, border="8"),
+    "Resume Section": dict(size=11.5, bold=True, color=ACCENT, space_before=7, space_after=4, border="6"),
+    "Resume Heading": dict(size=10.75, bold=True, color=RGBColor(32, 32, 32), space_before=4, space_after=2),
+    "Resume Body": dict(size=10.25, space_after=1.5, line_spacing=1.06),
+    "Resume Meta": dict(size=9.8, color=RGBColor(85, 85, 85), space_after=1.5, line_spacing=1.06),
+    "Resume Bullet": dict(size=10.25, space_after=1.5, line_spacing=1.08, left_indent=0.18, first_line_indent=-0.18),
+    "Letter Body": dict(size=10.75, alignment=WD_ALIGN_PARAGRAPH.LEFT, space_after=8, line_spacing=1.08),
+}
+
+# Built once at import; every PDF build shares them
+PDF_BASE_STYLE = getSampleStyleSheet()["Normal"]
+PDF_STYLES = {
+    "name": ParagraphStyle(
+        "ResumeName",
+        parent=PDF_BASE_STYLE,
+        fontName="Helvetica-Bold",
+        textColor=ACCENT_COLOR,
+        fontSize=18,
+        leading=21,
+        alignment=TA_CENTER,
+        spaceAfter=2,
+    ),
+    "title": ParagraphStyle(
+        "ResumeTitle",
+        parent=PDF_BASE_STYLE,
+        fontName="Helvetica-Bold",
+        fontSize=11.5,
+        leading=13,
+        textColor=colors.HexColor("#444444"),
+        alignment=TA_CENTER,
+        spaceAfter=4,
+    ),
+    "header": ParagraphStyle(
+        "ResumeHeader",
+        parent=PDF_BASE_STYLE,
+        fontName="Helvetica",
+        fontSize=9.5,
+        textColor=colors.HexColor("#333333"),
+        leading=11,
+        alignment=TA_CENTER,
+        spaceAfter=1,
+    ),
+    "section": ParagraphStyle(
+        "ResumeSection",
+        parent=PDF_BASE_STYLE,
+        fontName="Helvetica-Bold",
+        textColor=ACCENT_COLOR,
+        fontSize=11.5,
+        leading=14,
+        spaceBefore=7,
+        spaceAfter=3,
+        alignment=TA_LEFT,
+    ),
+    "heading": ParagraphStyle(
+        "ResumeHeading",
+        parent=PDF_BASE_STYLE,
+        fontName="Helvetica-Bold",
+        fontSize=10.75,
+        leading=13,
+        spaceBefore=4,
+        spaceAfter=2,
+        textColor=colors.HexColor("#222222"),
+    ),
+    "meta": ParagraphStyle(
+        "ResumeMeta",
+        parent=PDF_BASE_STYLE,
+        fontName="Helvetica",
+        fontSize=9.8,
+        textColor=colors.HexColor("#555555"),
+        leading=12,
+        spaceAfter=2,
+    ),
+    "body": ParagraphStyle(
+        "ResumeBody",
+        parent=PDF_BASE_STYLE,
+        fontName="Helvetica",
+        fontSize=10.25,
+        leading=13,
+        alignment=TA_JUSTIFY,
+        spaceAfter=2,
+    ),
+    "letter": ParagraphStyle(
+        "LetterBody",
+        parent=PDF_BASE_STYLE,
+        fontName="Helvetica",
+        fontSize=10.75,
+        leading=14,
+        alignment=TA_JUSTIFY,
+        spaceAfter=10,
+    ),
+}
+PDF_STYLES["bullet"] = ParagraphStyle(
+    "ResumeBullet",
+    parent=PDF_STYLES["body"],
+    leftIndent=11,
+    firstLineIndent=0,
+    spaceAfter=2,
+)
+
 
+class Span(NamedTuple):
+    text: str
+    bold: bool = False
+    url: str | None = None  # links keep their label in text
 
-def normalize_text(text: str) -> str:
-    text = LINK_RE.sub(r"\1: \2", text)
-    text = text.replace("**", "")
-    return text.strip()
+    def plain(self) -> str:
+        return f"{self.text}: {self.url}" if self.url else self.text
+
+
+class Line(NamedTuple):
+    kind: str  # "text", "bullet" (leading "- " removed) or "meta" (Live/GitHub link line)
+    spans: list[Span]
+
+
+def tokenize_inline(text: str) -> list[Span]:
+    """
+    Spans of a markdown fragment in one left-to-right pass: ** toggles bold and [label](url)
+    becomes a link span. A trailing ** without a partner is dropped and bolds nothing.
+    """
+    text = text.strip()
+    spans: list[Span] = []
+    bold_from = None  # index of the first span since the open **, if any
+    last = 0
+    for match in INLINE_RE.finditer(text):
+        if match.start() > last:
+            spans.append(Span(text[last:match.start()], bold_from is not None))
+        if match.group(1) is None:
+            bold_from = len(spans) if bold_from is None else None
+        else:
+            spans.append(Span(match.group(1), bold_from is not None, match.group(2)))
+        last = match.end()
+    if last < len(text):
+        spans.append(Span(text[last:], bold_from is not None))
+    if bold_from is not None:
+        spans[bold_from:] = [span._replace(bold=False) for span in spans[bold_from:]]
+    return spans
+
+
+def tokenize_line(text: str) -> Line:
+    if text.startswith("- "):
+        return Line("bullet", tokenize_inline(text[2:]))
+    spans = tokenize_inline(text)
+    is_meta = (bool(spans) and spans[0].bold and spans[0].text in META_LABELS) or any(
+        span.bold and span.text == "GitHub:" and previous.text.endswith(" | ")
+        for previous, span in zip(spans, spans[1:])
+    )
+    return Line("meta" if is_meta else "text", spans)
+
+
+def spans_markup(spans: list[Span]) -> str:
+    """ ReportLab paragraph markup: escaped text, <b> for bold and clickable links. """
+    parts = []
+    for span in spans:
+        text = escape(span.plain())
+        if span.url:
+            text = f"<link href={quoteattr(span.url)}>{text}</link>"
+        parts.append(f"<b>{text}</b>" if span.bold else text)
+    return "".join(parts)
 
 
 def add_page_number(run_paragraph) -> None:
@@ -81,7 +256,9 @@ def add_footer(document: Document) -> None:
 
 
 def set_paragraph_border(paragraph, position: str = "bottom", color: str = "1B365D", size: str = "6") -> None:
-    p_pr = paragraph._p.get_or_add_pPr()
+    """ Works on a paragraph or a paragraph style. """
+    element = paragraph._p if hasattr(paragraph, "_p") else paragraph.element
+    p_pr = element.get_or_add_pPr()
     p_bdr = p_pr.find(qn("w:pBdr"))
     if p_bdr is None:
         p_bdr = OxmlElement("w:pBdr")
@@ -96,32 +273,82 @@ def set_paragraph_border(paragraph, position: str = "bottom", color: str = "1B36
     border.set(qn("w:color"), color)
 
 
-def add_markdown_runs(paragraph, text: str, font_name: str = "Calibri", font_size: float = 10.5) -> None:
-    last = 0
-    for match in BOLD_RE.finditer(text):
-        if match.start() > last:
-            run = paragraph.add_run(normalize_text(text[last:match.start()]))
-            run.font.name = font_name
-            run.font.size = Pt(font_size)
-        run = paragraph.add_run(normalize_text(match.group(1)))
-        run.bold = True
-        run.font.name = font_name
-        run.font.size = Pt(font_size)
-        last = match.end()
-    if last < len(text):
-        run = paragraph.add_run(normalize_text(text[last:]))
-        run.font.name = font_name
-        run.font.size = Pt(font_size)
+def add_paragraph_style(document: Document, name: str, size: float | None = None, bold: bool = False, color: RGBColor | None = None,
+                        alignment=None, space_before: float | None = None, space_after: float | None = None,
+                        line_spacing: float | None = None, left_indent: float | None = None,
+                        first_line_indent: float | None = None, border: str | None = None) -> None:
+    style = document.styles.add_style(name, WD_STYLE_TYPE.PARAGRAPH)
+    style.base_style = document.styles["Normal"]
+    style.quick_style = True
+    style.font.name = "Calibri"
+    if size is not None:
+        style.font.size = Pt(size)
+    if bold:
+        style.font.bold = True
+    if color is not None:
+        style.font.color.rgb = color
+    fmt = style.paragraph_format
+    if alignment is not None:
+        fmt.alignment = alignment
+    if space_before is not None:
+        fmt.space_before = Pt(space_before)
+    if space_after is not None:
+        fmt.space_after = Pt(space_after)
+    if line_spacing is not None:
+        fmt.line_spacing = line_spacing
+    if left_indent is not None:
+        fmt.left_indent = Inches(left_indent)
+    if first_line_indent is not None:
+        fmt.first_line_indent = Inches(first_line_indent)
+    if border is not None:
+        set_paragraph_border(style, color="1B365D", size=border)
+
+
+@lru_cache(maxsize=None)
+def docx_template() -> tuple[bytes, dict[str, str]]:
+    """
+    Empty document with margins, footer and DOCX_STYLES, built and serialized once per process,
+    plus the style ID of each style name used by the builders.
+    """
+    doc = Document()
+    set_document_margins(doc)
+    add_footer(doc)
+    for name, spec in DOCX_STYLES.items():
+        add_paragraph_style(doc, name, **spec)
+    style_ids = {name: doc.styles[name].style_id for name in (*DOCX_STYLES, "Strong")}
+    buffer = BytesIO()
+    doc.save(buffer)
+    return buffer.getvalue(), style_ids
+
+
+def new_document() -> Document:
+    return Document(BytesIO(docx_template()[0]))
+
+
+def add_styled_paragraph(document: Document, style: str, text: str = ""):
+    # add_paragraph(style=...) searches the whole style table on every call; the IDs are known up front
+    paragraph = document.add_paragraph(text)
+    paragraph._p.style = docx_template()[1][style]
+    return paragraph
+
+
+def add_span_runs(paragraph, spans: list[Span]) -> None:
+    """ One run per span; size, font and colour come from the paragraph style, bold from Strong. """
+    strong = docx_template()[1]["Strong"]
+    for span in spans:
+        run = paragraph.add_run(span.plain())
+        if span.bold:
+            run._r.style = strong
 
 
 def parse_resume(md_path: Path) -> dict:
     lines = [line.rstrip() for line in md_path.read_text(encoding="utf-8").splitlines()]
     meaningful = [line for line in lines if line.strip() and line.strip() != "---"]
 
-    name = normalize_text(meaningful[0].replace("# ", "", 1))
-    title = normalize_text(meaningful[1])
-    contact = normalize_text(meaningful[2])
-    links = normalize_text(meaningful[3])
+    name = tokenize_inline(meaningful[0].replace("# ", "", 1))
+    title = tokenize_inline(meaningful[1])
+    contact = tokenize_inline(meaningful[2])
+    links = tokenize_inline(meaningful[3])
 
     sections = []
     current_section = None
@@ -133,7 +360,7 @@ def parse_resume(md_path: Path) -> dict:
             sections.append(current_section)
             current_item = None
         elif raw.startswith("### "):
-            current_item = {"heading": raw[4:].strip(), "lines": []}
+            current_item = {"heading": tokenize_inline(raw[4:]), "lines": []}
             if current_section is None:
                 current_section = {"title": "", "items": []}
                 sections.append(current_section)
@@ -144,7 +371,7 @@ def parse_resume(md_path: Path) -> dict:
             if current_item is None:
                 current_item = {"heading": None, "lines": []}
                 current_section["items"].append(current_item)
-            current_item["lines"].append(raw)
+            current_item["lines"].append(tokenize_line(raw))
 
     return {
         "name": name,
@@ -156,85 +383,28 @@ def parse_resume(md_path: Path) -> dict:
 
 
 def build_resume_docx(data: dict, output_path: Path) -> None:
-    doc = Document()
-    set_document_margins(doc)
-    add_footer(doc)
-
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p.paragraph_format.space_after = Pt(2)
-    r = p.add_run(data["name"])
-    r.bold = True
-    r.font.name = "Calibri"
-    r.font.size = Pt(18)
-    r.font.color.rgb = ACCENT
-
-    p = doc.add_paragraph()
-    p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-    p.paragraph_format.space_after = Pt(4)
-    r = p.add_run(data["title"])
-    r.bold = True
-    r.font.name = "Calibri"
-    r.font.size = Pt(11.5)
-    r.font.color.rgb = RGBColor(68, 68, 68)
+    doc = new_document()
 
+    add_span_runs(add_styled_paragraph(doc, "Resume Name"), data["name"])
+    add_span_runs(add_styled_paragraph(doc, "Resume Title"), data["title"])
     for header_line in (data["contact"], data["links"]):
-        p = doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        p.paragraph_format.space_after = Pt(2)
-        r = p.add_run(header_line)
-        r.font.name = "Calibri"
-        r.font.size = Pt(9.5)
-        r.font.color.rgb = RGBColor(55, 55, 55)
-
-    divider = doc.add_paragraph()
-    divider.paragraph_format.space_before = Pt(2)
-    divider.paragraph_format.space_after = Pt(7)
-    set_paragraph_border(divider, color="1B365D", size="8")
+        add_span_runs(add_styled_paragraph(doc, "Resume Header"), header_line)
+    add_styled_paragraph(doc, "Resume Divider")
 
     for section in data["sections"]:
-        p = doc.add_paragraph()
-        p.paragraph_format.space_before = Pt(7)
-        p.paragraph_format.space_after = Pt(4)
-        r = p.add_run(section["title"].upper())
-        r.bold = True
-        r.font.name = "Calibri"
-        r.font.size = Pt(11.5)
-        r.font.color.rgb = ACCENT
-        set_paragraph_border(p, color="1B365D", size="6")
+        add_styled_paragraph(doc, "Resume Section", section["title"].upper())
 
         for item in section["items"]:
             if item["heading"]:
-                p = doc.add_paragraph()
-                p.paragraph_format.space_before = Pt(4)
-                p.paragraph_format.space_after = Pt(2)
-                r = p.add_run(item["heading"])
-                r.bold = True
-                r.font.name = "Calibri"
-                r.font.size = Pt(10.75)
-                r.font.color.rgb = RGBColor(32, 32, 32)
+                add_span_runs(add_styled_paragraph(doc, "Resume Heading"), item["heading"])
 
             for line in item["lines"]:
-                if line.startswith("- "):
-                    p = doc.add_paragraph()
-                    p.paragraph_format.left_indent = Inches(0.18)
-                    p.paragraph_format.first_line_indent = Inches(-0.18)
-                    p.paragraph_format.space_after = Pt(1.5)
-                    p.paragraph_format.line_spacing = 1.08
-                    lead = p.add_run("- ")
-                    lead.font.name = "Calibri"
-                    lead.font.size = Pt(10.25)
-                    add_markdown_runs(p, line[2:], font_size=10.25)
+                if line.kind == "bullet":
+                    add_span_runs(add_styled_paragraph(doc, "Resume Bullet", "- "), line.spans)
+                elif line.kind == "meta":
+                    add_span_runs(add_styled_paragraph(doc, "Resume Meta"), line.spans)
                 else:
-                    p = doc.add_paragraph()
-                    p.paragraph_format.space_after = Pt(1.5)
-                    p.paragraph_format.line_spacing = 1.06
-                    if line.startswith("**Live:**") or line.startswith("**GitHub:**") or line.startswith("**Live:**") or line.startswith("**GitHub:**") or " | **GitHub:**" in line:
-                        add_markdown_runs(p, line, font_size=9.8)
-                        for run in p.runs:
-                            run.font.color.rgb = RGBColor(85, 85, 85)
-                    else:
-                        add_markdown_runs(p, line, font_size=10.25)
+                    add_span_runs(add_styled_paragraph(doc, "Resume Body"), line.spans)
 
     temp_path = output_path.with_suffix(output_path.suffix + ".tmp")
     doc.save(temp_path)
@@ -242,106 +412,28 @@ def build_resume_docx(data: dict, output_path: Path) -> None:
 
 
 def build_resume_pdf(data: dict, output_path: Path, document_title: str) -> None:
-    styles = getSampleStyleSheet()
-    name_style = ParagraphStyle(
-        "ResumeName",
-        parent=styles["Normal"],
-        fontName="Helvetica-Bold",
-        textColor=colors.HexColor(ACCENT_HEX),
-        fontSize=18,
-        leading=21,
-        alignment=TA_CENTER,
-        spaceAfter=2,
-    )
-    title_style = ParagraphStyle(
-        "ResumeTitle",
-        parent=styles["Normal"],
-        fontName="Helvetica-Bold",
-        fontSize=11.5,
-        leading=13,
-        textColor=colors.HexColor("#444444"),
-        alignment=TA_CENTER,
-        spaceAfter=4,
-    )
-    header_style = ParagraphStyle(
-        "ResumeHeader",
-        parent=styles["Normal"],
-        fontName="Helvetica",
-        fontSize=9.5,
-        textColor=colors.HexColor("#333333"),
-        leading=11,
-        alignment=TA_CENTER,
-        spaceAfter=1,
-    )
-    section_style = ParagraphStyle(
-        "ResumeSection",
-        parent=styles["Normal"],
-        fontName="Helvetica-Bold",
-        textColor=colors.HexColor(ACCENT_HEX),
-        fontSize=11.5,
-        leading=14,
-        spaceBefore=7,
-        spaceAfter=3,
-        alignment=TA_LEFT,
-    )
-    heading_style = ParagraphStyle(
-        "ResumeHeading",
-        parent=styles["Normal"],
-        fontName="Helvetica-Bold",
-        fontSize=10.75,
-        leading=13,
-        spaceBefore=4,
-        spaceAfter=2,
-        textColor=colors.HexColor("#222222"),
-    )
-    meta_style = ParagraphStyle(
-        "ResumeMeta",
-        parent=styles["Normal"],
-        fontName="Helvetica",
-        fontSize=9.8,
-        textColor=colors.HexColor("#555555"),
-        leading=12,
-        spaceAfter=2,
-    )
-    body_style = ParagraphStyle(
-        "ResumeBody",
-        parent=styles["Normal"],
-        fontName="Helvetica",
-        fontSize=10.25,
-        leading=13,
-        alignment=TA_JUSTIFY,
-        spaceAfter=2,
-    )
-    bullet_style = ParagraphStyle(
-        "ResumeBullet",
-        parent=body_style,
-        leftIndent=11,
-        firstLineIndent=0,
-        spaceAfter=2,
-    )
-
     story = [
-        Paragraph(data["name"], name_style),
-        Paragraph(data["title"], title_style),
-        Paragraph(data["contact"], header_style),
-        Paragraph(data["links"], header_style),
+        Paragraph(spans_markup(data["name"]), PDF_STYLES["name"]),
+        Paragraph(spans_markup(data["title"]), PDF_STYLES["title"]),
+        Paragraph(spans_markup(data["contact"]), PDF_STYLES["header"]),
+        Paragraph(spans_markup(data["links"]), PDF_STYLES["header"]),
         Spacer(1, 0.02 * inch),
-        HRFlowable(width="100%", thickness=1.1, color=colors.HexColor(ACCENT_HEX), spaceBefore=0, spaceAfter=8),
+        HRFlowable(width="100%", thickness=1.1, color=ACCENT_COLOR, spaceBefore=0, spaceAfter=8),
     ]
 
     for section in data["sections"]:
-        story.append(Paragraph(section["title"].upper(), section_style))
-        story.append(HRFlowable(width="100%", thickness=0.8, color=colors.HexColor(ACCENT_HEX), spaceBefore=0, spaceAfter=4))
+        story.append(Paragraph(escape(section["title"].upper()), PDF_STYLES["section"]))
+        story.append(HRFlowable(width="100%", thickness=0.8, color=ACCENT_COLOR, spaceBefore=0, spaceAfter=4))
         for item in section["items"]:
             if item["heading"]:
-                story.append(Paragraph(item["heading"], heading_style))
+                story.append(Paragraph(spans_markup(item["heading"]), PDF_STYLES["heading"]))
             for line in item["lines"]:
-                if line.startswith("- "):
-                    story.append(Paragraph(f"- {normalize_text(line[2:])}", bullet_style))
-                elif line.startswith("**Live:**") or line.startswith("**GitHub:**") or " | **GitHub:**" in line:
-                    story.append(Paragraph(normalize_text(line), meta_style))
+                if line.kind == "bullet":
+                    story.append(Paragraph(f"- {spans_markup(line.spans)}", PDF_STYLES["bullet"]))
+                elif line.kind == "meta":
+                    story.append(Paragraph(spans_markup(line.spans), PDF_STYLES["meta"]))
                 else:
-                    story.append(Paragraph(normalize_text(line), body_style))
+                    story.append(Paragraph(spans_markup(line.spans), PDF_STYLES["body"]))
 
     doc = SimpleDocTemplate(
         str(output_path.with_suffix(output_path.suffix + ".tmp")),
@@ -358,22 +450,17 @@ def build_resume_pdf(data: dict, output_path: Path, document_title: str) -> None
     temp_path.replace(output_path)
 
 
-def parse_cover_letter(md_path: Path) -> list[str]:
+def parse_cover_letter(md_path: Path) -> list[list[Span]]:
     lines = [line.strip() for line in md_path.read_text(encoding="utf-8").splitlines()]
-    return [normalize_text(line) for line in lines if line]
+    return [tokenize_inline(line) for line in lines if line]
 
 
-def build_letter_docx(paragraphs: list[str], output_path: Path) -> None:
-    doc = Document()
-    set_document_margins(doc)
-    add_footer(doc)
+def build_letter_docx(paragraphs: list[list[Span]], output_path: Path) -> None:
+    doc = new_document()
 
-    for index, text in enumerate(paragraphs):
-        p = doc.add_paragraph()
-        p.alignment = WD_ALIGN_PARAGRAPH.LEFT
-        p.paragraph_format.space_after = Pt(8)
-        p.paragraph_format.line_spacing = 1.08
-        add_markdown_runs(p, text, font_size=10.75)
+    for index, spans in enumerate(paragraphs):
+        p = add_styled_paragraph(doc, "Letter Body")
+        add_span_runs(p, spans)
         if index == 0:
             p.paragraph_format.space_before = Pt(2)
 
@@ -382,18 +469,8 @@ def build_letter_docx(paragraphs: list[str], output_path: Path) -> None:
     temp_path.replace(output_path)
 
 
-def build_letter_pdf(paragraphs: list[str], output_path: Path, document_title: str) -> None:
-    styles = getSampleStyleSheet()
-    body_style = ParagraphStyle(
-        "LetterBody",
-        parent=styles["Normal"],
-        fontName="Helvetica",
-        fontSize=10.75,
-        leading=14,
-        alignment=TA_JUSTIFY,
-        spaceAfter=10,
-    )
-    story = [Paragraph(text, body_style) for text in paragraphs]
+def build_letter_pdf(paragraphs: list[list[Span]], output_path: Path, document_title: str) -> None:
+    story = [Paragraph(spans_markup(spans), PDF_STYLES["letter"]) for spans in paragraphs]
 
     doc = SimpleDocTemplate(
         str(output_path.with_suffix(output_path.suffix + ".tmp")),
@@ -410,33 +487,231 @@ def build_letter_pdf(paragraphs: list[str], output_path: Path, document_title: s
     temp_path.replace(output_path)
 
 
+# Every preset builds these four files; each is one job, and jobs can run on different processes
+ARTIFACT_BUILDERS = {
+    "resume_docx": lambda preset, data: build_resume_docx(data, preset["resume_docx"]),
+    "resume_pdf": lambda preset, data: build_resume_pdf(data, preset["resume_pdf"], preset["resume_title"]),
+    "cover_docx": lambda preset, data: build_letter_docx(data, preset["cover_docx"]),
+    "cover_pdf": lambda preset, data: build_letter_pdf(data, preset["cover_pdf"], preset["cover_title"]),
+}
+ARTIFACT_SOURCES = {
+    "resume_docx": "resume_md",
+    "resume_pdf": "resume_md",
+    "cover_docx": "cover_md",
+    "cover_pdf": "cover_md",
+}
+SOURCE_PARSERS = {"resume_md": parse_resume, "cover_md": parse_cover_letter}
+
+
+def select_presets(patterns: list[str]) -> list[str]:
+    """ Preset names matching any of the given names or shell-style globs, in PRESETS order. """
+    selected = [name for name in PRESETS if any(fnmatch.fnmatchcase(name, pattern) for pattern in patterns)]
+    unmatched = [pattern for pattern in patterns if not fnmatch.filter(PRESETS, pattern)]
+    if unmatched:
+        raise SystemExit(f"No preset matches: {', '.join(unmatched)} (available: {', '.join(sorted(PRESETS))})")
+    return selected
+
+
+def parse_sources(keys: list[tuple[str, str]]) -> dict[tuple[str, str], object]:
+    """ Each (preset, source) markdown file parsed once; the DOCX and PDF jobs share the result. """
+    return {(name, source): SOURCE_PARSERS[source](PRESETS[name][source]) for name, source in keys}
+
+
+def generator_fingerprint() -> str:
+    """
+    Hash of this file (builders and style constants live here) and the rendering library versions;
+    any change to either makes every artifact stale.
+    """
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    for package in ("python-docx", "reportlab"):
+        digest.update(f"{package}=={metadata.version(package)}".encode("utf-8"))
+    return digest.hexdigest()
+
+
+def artifact_fingerprint(generator: str, preset: dict, artifact: str, source_digest: str) -> str:
+    kind = artifact.split("_", 1)[0]
+    inputs = [generator, artifact, source_digest, preset[f"{kind}_title"]]
+    return hashlib.sha256(json.dumps(inputs).encode("utf-8")).hexdigest()
+
+
+def load_build_manifest() -> dict[str, str]:
+    if not BUILD_MANIFEST_FILE.exists():
+        return {}
+    try:
+        return json.loads(BUILD_MANIFEST_FILE.read_text(encoding="utf-8")).get("artifacts", {})
+    except json.JSONDecodeError:
+        return {}
+
+
+def save_build_manifest(entries: dict[str, str]) -> None:
+    write_json_atomic(BUILD_MANIFEST_FILE, {"artifacts": entries})
+
+
+def build_artifact(preset_name: str, artifact: str, data) -> float:
+    """ Build one output file and return the seconds it took. Runs in a worker process. """
+    started = time.perf_counter()
+    ARTIFACT_BUILDERS[artifact](PRESETS[preset_name], data)
+    return time.perf_counter() - started
+
+
+def run_jobs(jobs: list[tuple[str, str]], parsed: dict, workers: int):
+    """ Yield (preset, artifact, seconds) as each job finishes; one worker builds them in order in-process. """
+    if workers <= 1:
+        for name, artifact in jobs:
+            yield name, artifact, build_artifact(name, artifact, parsed[name, ARTIFACT_SOURCES[artifact]])
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {
+            pool.submit(build_artifact, name, artifact, parsed[name, ARTIFACT_SOURCES[artifact]]): (name, artifact)
+            for name, artifact in jobs
+        }
+        for future in as_completed(futures):
+            name, artifact = futures[future]
+            yield name, artifact, future.result()
+
+
+def plan_jobs(preset_names: list[str], manifest: dict[str, str], generator: str, force: bool):
+    """
+    (stale jobs, fingerprint of every selected artifact). An artifact is stale when its fingerprint
+    (generator, source markdown, title) differs from the manifest or its file is gone.
+    """
+    source_digests = {
+        (name, source): hashlib.sha256(PRESETS[name][source].read_bytes()).hexdigest()
+        for name in preset_names
+        for source in SOURCE_PARSERS
+    }
+    fingerprints = {}
+    jobs = []
+    for name in preset_names:
+        for artifact in ARTIFACT_BUILDERS:
+            fingerprint = artifact_fingerprint(
+                generator, PRESETS[name], artifact, source_digests[name, ARTIFACT_SOURCES[artifact]]
+            )
+            fingerprints[name, artifact] = fingerprint
+            if force or manifest.get(f"{name}/{artifact}") != fingerprint or not PRESETS[name][artifact].exists():
+                jobs.append((name, artifact))
+    return jobs, fingerprints
+
+
+def build_jobs(jobs: list[tuple[str, str]], fingerprints: dict, manifest: dict[str, str], workers: int) -> float:
+    """ Parse the sources the jobs need, build them and record each in the manifest. Returns summed build seconds. """
+    parsed = parse_sources(sorted({(name, ARTIFACT_SOURCES[artifact]) for name, artifact in jobs}))
+    busy = 0.0
+    try:
+        for name, artifact, elapsed in run_jobs(jobs, parsed, workers):
+            busy += elapsed
+            manifest[f"{name}/{artifact}"] = fingerprints[name, artifact]
+            print(f"Generated: {PRESETS[name][artifact]} ({elapsed:.2f}s)")
+    finally:
+        # Finished artifacts are recorded even if a later job failed
+        save_build_manifest(manifest)
+    return busy
+
+
+def source_state(path: Path):
+    try:
+        stat = path.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+def watch(preset_names: list[str], manifest: dict[str, str], generator: str, interval: float) -> None:
+    """
+    Poll the presets' markdown files and rebuild, in this process with the libraries already
+    loaded, only the artifacts of a file that changed. Saving without edits rebuilds nothing,
+    and a failed build (e.g. a half-written file) is reported and retried on the next save.
+    """
+    watched: dict[Path, list[str]] = {}
+    for name in preset_names:
+        for source in SOURCE_PARSERS:
+            watched.setdefault(PRESETS[name][source], []).append(name)
+    states = {path: source_state(path) for path in watched}
+    print(f"Watching {len(watched)} markdown files every {interval:g}s (Ctrl+C to stop)...")
+
+    while True:
+        time.sleep(interval)
+        changed = []
+        for path in watched:
+            state = source_state(path)
+            if state != states[path]:
+                states[path] = state
+                if state is not None:
+                    changed.append(path)
+        if not changed:
+            continue
+
+        started = time.perf_counter()
+        affected = [name for name in preset_names if any(name in watched[path] for path in changed)]
+        try:
+            jobs, fingerprints = plan_jobs(affected, manifest, generator, force=False)
+            if jobs:
+                build_jobs(jobs, fingerprints, manifest, workers=1)
+        except Exception as exc:
+            print(f"Build failed for {', '.join(path.name for path in changed)}: {exc!r}")
+            continue
+        if jobs:
+            print(f"Rebuilt {len(jobs)} artifacts after editing {', '.join(path.name for path in changed)} "
+                  f"in {(time.perf_counter() - started) * 1000:.0f} ms.")
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Generate application documents from markdown sources.")
     parser.add_argument(
         "--preset",
-        default="access_bank_software_engineer",
-        choices=sorted(PRESETS),
-        help="Document preset to build.",
+        nargs="+",
+        default=["access_bank_software_engineer"],
+        metavar="NAME",
+        help=f"Document presets to build; shell-style globs are allowed (choices: {', '.join(sorted(PRESETS))}).",
+    )
+    parser.add_argument("--all", action="store_true", help="Build every preset.")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Processes building artifacts in parallel (1 builds everything in this process).",
     )
-    return parser.parse_args()
+    parser.add_argument("--force", action="store_true", help="Rebuild every selected artifact, even if it is up to date.")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After building, keep running and rebuild the affected artifacts whenever a preset's markdown is saved.",
+    )
+    parser.add_argument("--interval", type=float, default=0.2, help="Seconds between checks for changes in --watch mode.")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.interval <= 0:
+        parser.error("--interval must be positive")
+    return args
 
 
 def main() -> None:
     args = parse_args()
-    preset = PRESETS[args.preset]
-
-    resume_data = parse_resume(preset["resume_md"])
-    cover_paragraphs = parse_cover_letter(preset["cover_md"])
-
-    build_resume_docx(resume_data, preset["resume_docx"])
-    build_resume_pdf(resume_data, preset["resume_pdf"], preset["resume_title"])
-    build_letter_docx(cover_paragraphs, preset["cover_docx"])
-    build_letter_pdf(cover_paragraphs, preset["cover_pdf"], preset["cover_title"])
-
-    print(f"Generated: {preset['resume_docx']}")
-    print(f"Generated: {preset['resume_pdf']}")
-    print(f"Generated: {preset['cover_docx']}")
-    print(f"Generated: {preset['cover_pdf']}")
+    started = time.perf_counter()
+    preset_names = list(PRESETS) if args.all else select_presets(args.preset)
+
+    generator = generator_fingerprint()
+    manifest = load_build_manifest()
+    jobs, fingerprints = plan_jobs(preset_names, manifest, generator, args.force)
+    skipped = len(fingerprints) - len(jobs)
+    if not jobs:
+        print(f"All {skipped} artifacts up to date (use --force to rebuild).")
+    else:
+        workers = min(args.jobs, len(jobs))
+        busy = build_jobs(jobs, fingerprints, manifest, workers)
+        total = time.perf_counter() - started
+        print(
+            f"Built {len(jobs)} artifacts for {len(preset_names)} presets in {total:.2f}s "
+            f"({busy:.2f}s of build time, {workers} workers); {skipped} up to date."
+        )
+
+    if args.watch:
+        try:
+            watch(preset_names, manifest, generator, args.interval)
+        except KeyboardInterrupt:
+            print("Stopped watching.")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,68 @@
+import argparse
+import re
+import sqlite3
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+INDEX_FILE = BASE_DIR / ".cache" / "fetch_projects" / "context_index.sqlite"  # built by fetch_projects.py
+
+
+def to_fts_query(query: str) -> str:
+    """ Plain words as an AND of quoted terms, so punctuation like C++ or next.js is not read as FTS syntax. """
+    terms = re.findall(r"[^\s\"]+", query)
+    return " ".join(f'"{term}"' for term in terms)
+
+
+def search(db: sqlite3.Connection, query: str, limit: int, repo: Optional[str] = None, raw: bool = False) -> List[Tuple]:
+    """ Ranked (repo, title, section, snippet, score) rows; lower bm25 scores are better matches. """
+    sql = """
+        SELECT repo, title, section, snippet(sections, 3, '[', ']', ' ... ', 16), bm25(sections, 0.0, 4.0, 2.0, 1.0) AS score
+        FROM sections
+        WHERE sections MATCH ?
+    """
+    params = [query if raw else to_fts_query(query)]
+    if repo:
+        sql += " AND repo = ?"
+        params.append(repo)
+    sql += " ORDER BY score LIMIT ?"
+    params.append(limit)
+    return db.execute(sql, params).fetchall()
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Search the projects context index for README/docs sections.")
+    parser.add_argument("query", help="Words to look for; every word must appear in a section.")
+    parser.add_argument("--limit", type=int, default=10, help="Maximum number of sections to show.")
+    parser.add_argument("--repo", help="Only search this repository (owner/name).")
+    parser.add_argument(
+        "--raw",
+        action="store_true",
+        help="Pass the query to SQLite FTS5 as-is (OR, NEAR, prefix* and column filters).",
+    )
+    parser.add_argument("--index", type=Path, default=INDEX_FILE, help="Index file to query.")
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    if not args.index.exists():
+        raise SystemExit(f"No index at {args.index}; run scripts/fetch_projects.py first.")
+
+    db = sqlite3.connect(f"{args.index.resolve().as_uri()}?mode=ro", uri=True)
+    started = time.perf_counter()
+    try:
+        rows = search(db, args.query, args.limit, args.repo, args.raw)
+    except sqlite3.OperationalError as exc:
+        raise SystemExit(f"Invalid query: {exc}")
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    for repo, title, section, snippet, score in rows:
+        print(f"{title} ({repo}) - {section}  [{-score:.2f}]")
+        print(f"    {' '.join(snippet.split())}")
+    print(f"{len(rows)} sections in {elapsed_ms:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
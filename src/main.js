@@ -77,7 +77,14 @@ function renderProjects(filter = 'all') {
     let fallbackText = getInitials(project.title);
     if (project.thumb) {
       const thumbWebp = project.thumb.replace(/\.(png|jpg|jpeg)$/i, '.webp');
-      imageContent = `<picture><source srcset="${thumbWebp}" type="image/webp"><img src="${project.thumb}" alt="${project.title}" loading="lazy" onerror="this.parentElement.innerHTML='<div class=\\'card-placeholder\\'>${fallbackText}</div>'"></picture>`;
+      // Intrinsic size and resized variants (written by fetch_projects.py) for the card's image
+      const thumbImage = (project.images || []).find(img =>
+        img.url === project.thumb || (img.srcset || []).some(variant => variant.url === project.thumb));
+      const sizeAttrs = thumbImage && thumbImage.width ? ` width="${thumbImage.width}" height="${thumbImage.height}"` : '';
+      const sources = thumbImage && thumbImage.srcset
+        ? srcsetSources(thumbImage.srcset, '(max-width: 768px) 100vw, 400px')
+        : `<source srcset="${thumbWebp}" type="image/webp">`;
+      imageContent = `<picture>${sources}<img src="${project.thumb}" alt="${project.title}"${sizeAttrs} loading="lazy" onerror="this.parentElement.innerHTML='<div class=\\'card-placeholder\\'>${fallbackText}</div>'"></picture>`;
     } else {
       imageContent = `<div class="card-placeholder">${fallbackText}</div>`;
     }
@@ -156,6 +163,17 @@ function getInitials(title) {
   return title.split(' ').map(n => n[0]).join('').substring(0, 2).toUpperCase();
 }
 
+// One <source> per format, e.g. AVIF before WebP, from a project image's srcset list
+function srcsetSources(srcset, sizes) {
+  const byType = {};
+  srcset.forEach(variant => {
+    (byType[variant.type] = byType[variant.type] || []).push(`${variant.url} ${variant.width}w`);
+  });
+  return Object.entries(byType)
+    .map(([type, candidates]) => `<source type="${type}" srcset="${candidates.join(', ')}" sizes="${sizes}">`)
+    .join('');
+}
+
 function truncateText(text, limit) {
   if (!text) return '';
   if (text.length <= limit) return text;
@@ -267,7 +285,21 @@ function updateSlide() {
     const data = images[currentSlideIndex];
     const slideSource = document.getElementById('slide-source');
     slideImg.src = data.url;
-    slideSource.srcset = data.url.replace(/\.(png|jpg|jpeg)$/i, '.webp');
+    if (data.width && data.height) {
+      slideImg.width = data.width;
+      slideImg.height = data.height;
+    } else {
+      slideImg.removeAttribute('width');
+      slideImg.removeAttribute('height');
+    }
+    const webpVariants = (data.srcset || []).filter(variant => variant.type === 'image/webp');
+    if (webpVariants.length) {
+      slideSource.srcset = webpVariants.map(variant => `${variant.url} ${variant.width}w`).join(', ');
+      slideSource.sizes = '100vw';
+    } else {
+      slideSource.srcset = data.url.replace(/\.(png|jpg|jpeg)$/i, '.webp');
+      slideSource.removeAttribute('sizes');
+    }
     slideCaption.textContent = data.caption || '';
 
     // Hide caption if empty